@@ -1,8 +1,8 @@
 # app.py
 
 import dash
-from dash import dcc, html, Input, Output
-import plotly.express as px
+from dash import dcc, html, Input, Output, State, ClientsideFunction
+import pandas as pd
 import dash_bootstrap_components as dbc
 import logging
 import data_fetcher  # Import the new module for data fetching
@@ -53,6 +53,7 @@ app.layout = html.Div([
                 id="loading-spinner",
                 type="circle",  # Loading spinner type
                 children=[
+                    dcc.Store(id="sunburst-store"),  # Columnar sunburst data shared with the clientside callbacks
                     html.Div(dcc.Graph(id="sunburst-chart")),
                     html.Div(id="sunburst-info", style={"marginTop": "20px"})  # For displaying info on click
                 ],
@@ -62,51 +63,49 @@ app.layout = html.Div([
     ])
 ])
 
-# Define callback for Sunburst chart
+# Define callback that ships the Sunburst data to the browser
 @app.callback(
-    Output("sunburst-chart", "figure"),
+    Output("sunburst-store", "data"),
     Input("sunburst-chart", "id")
 )
-def update_sunburst_chart(_):
-    logger.info("Updating Sunburst chart.")
+def update_sunburst_store(_):
+    logger.info("Updating Sunburst data.")
     data = data_fetcher.fetch_sunburst_data()
     if data.empty:
         logger.warning("No data found for Sunburst chart.")
-    
+        return None
+
     # Use a Seaborn color palette for the sunburst chart
-    palette = sns.color_palette("Set3", n_colors=len(data["collective_name"].unique()))
-    color_map = {collective: f"rgb{tuple(int(x*255) for x in color)}" for collective, color in zip(data["collective_name"].unique(), palette)}
+    codes, collectives = pd.factorize(data["collective_name"])
+    palette = sns.color_palette("Set3", n_colors=len(collectives))
+    color_map = {collective: f"rgb{tuple(int(x*255) for x in color)}" for collective, color in zip(collectives, palette)}
 
-    # Create the Sunburst chart
-    fig = px.sunburst(
-        data,
-        path=['collective_name', 'name'],  # Path defines the hierarchy
-        values='tag_count',  # Size of each slice
-        color='collective_name',  # Color by collective
-        color_discrete_map=color_map  # Use Seaborn palette
-    )
-    fig.update_layout(margin=dict(t=0, l=0, r=0, b=0))
-    logger.info("Sunburst chart updated.")
-    return fig
+    # Columnar layout with collective names dictionary-encoded; the figure is built clientside
+    store = {
+        "collectives": collectives.tolist(),
+        "collective": codes.tolist(),
+        "name": data["name"].tolist(),
+        "tag_count": data["tag_count"].tolist(),
+        "collective_total_count": data["collective_total_count"].tolist(),
+        "colors": color_map
+    }
+    logger.info("Sunburst data updated.")
+    return store
 
-# Callback for displaying additional information on click
-@app.callback(
+# Build the Sunburst chart in the browser from the stored data
+app.clientside_callback(
+    ClientsideFunction(namespace="sunburst", function_name="build_figure"),
+    Output("sunburst-chart", "figure"),
+    Input("sunburst-store", "data")
+)
+
+# Display additional information on click without a server round trip
+app.clientside_callback(
+    ClientsideFunction(namespace="sunburst", function_name="display_info"),
     Output("sunburst-info", "children"),
-    Input("sunburst-chart", "clickData")
+    Input("sunburst-chart", "clickData"),
+    State("sunburst-store", "data")
 )
-def display_sunburst_info(clickData):
-    if clickData:
-        point = clickData['points'][0]
-        collective_name = point['label']
-        count = point.get('value', 'N/A')
-        
-        # Additional info based on click context
-        info_text = f"Collective: {collective_name}<br>Tag Count: {count}<br>"
-        return html.Div([
-            html.H4("Selected Details"),
-            html.P(info_text)
-        ])
-    return html.Div("Click on a segment to view details")
 
 # Run the server
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+# app_growth.py
+
+import dash
+from dash import dcc, html, Input, Output
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+import logging
+import data_fetcher_growth  # Import the tag count history fetcher
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Initialize Dash app with Bootstrap
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app.title = "Tag Growth"
+logger.info("Dash app initialized for Tag Growth.")
+
+# Layout with description, disclaimer, and the growth charts
+app.layout = dbc.Container([
+    # Title and Description Section
+    html.Div([
+        html.H1("Tag Growth", className="display-4 text-center my-4"),
+
+        dbc.Container([
+            dbc.Row([
+                dbc.Col([
+                    html.P("This dashboard shows how the question counts of tags change between refreshes of the tag data.",
+                           className="lead"),
+
+                    html.P("How to Use:", className="font-weight-bold mt-4"),
+                    html.Ul([
+                        html.Li("Pick a start and an end snapshot."),
+                        html.Li("Rank tags by relative growth or by the number of questions gained."),
+                        html.Li("The bar charts show the fastest risers and fallers; the line chart shows their counts in every snapshot.")
+                    ]),
+
+                    html.P(f"Disclaimer: Only tags with at least {data_fetcher_growth.MIN_COUNT} questions at the start "
+                           "snapshot are ranked. Snapshots are taken each time insert_tags.py completes a refresh.",
+                           className="text-muted mt-4")
+                ], width=10),
+            ], justify="center")
+        ], className="mb-4")
+    ]),
+
+    dbc.Row([
+        # Options are filled in on page load, so snapshots taken while the server runs show up
+        dbc.Col(dcc.Dropdown(id="start-snapshot", placeholder="Start snapshot", clearable=False), width=3),
+        dbc.Col(dcc.Dropdown(id="end-snapshot", placeholder="End snapshot", clearable=False), width=3),
+        dbc.Col(dcc.RadioItems(
+            id="growth-measure",
+            options=[{"label": "Growth rate", "value": "growth_rate"}, {"label": "Questions gained", "value": "change"}],
+            value="growth_rate",
+            inline=True,
+            inputStyle={"marginRight": "4px", "marginLeft": "10px"}
+        ), width=3),
+    ], justify="center", className="mb-3"),
+    html.Div(id="growth-message", className="text-center text-muted"),
+
+    dbc.Row([
+        dbc.Col(dcc.Graph(id="risers-graph"), width=6),
+        dbc.Col(dcc.Graph(id="fallers-graph"), width=6)
+    ]),
+    dcc.Graph(id="history-graph")
+], fluid=True)
+
+
+def ranking_figure(ranked, measure, title, color):
+    """Horizontal bar chart of ranked tags, first rank at the top."""
+    values = ranked[measure] * 100 if measure == "growth_rate" else ranked[measure]
+    fig = go.Figure(go.Bar(
+        x=values[::-1],
+        y=ranked["tag_name"][::-1],
+        orientation="h",
+        marker=dict(color=color),
+        customdata=ranked[["start_count", "end_count"]][::-1],
+        hovertemplate="%{y}: %{x:.2f}<br>%{customdata[0]} → %{customdata[1]} questions<extra></extra>"
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Growth (%)" if measure == "growth_rate" else "Questions gained",
+        margin=dict(t=50, b=30)
+    )
+    return fig
+
+
+# Callback to list the stored snapshots whenever the page is loaded
+@app.callback(
+    [Output("start-snapshot", "options"), Output("start-snapshot", "value"),
+     Output("end-snapshot", "options"), Output("end-snapshot", "value")],
+    Input("start-snapshot", "id")
+)
+def load_snapshot_dates(_):
+    snapshot_dates = data_fetcher_growth.get_snapshot_dates()
+    options = [{"label": snapshot_date, "value": snapshot_date} for snapshot_date in snapshot_dates]
+    if not snapshot_dates:
+        return options, None, options, None
+    return options, snapshot_dates[0], options, snapshot_dates[-1]
+
+
+# Callback to rank tags and draw their history
+@app.callback(
+    [Output("risers-graph", "figure"), Output("fallers-graph", "figure"),
+     Output("history-graph", "figure"), Output("growth-message", "children")],
+    [Input("start-snapshot", "value"), Input("end-snapshot", "value"), Input("growth-measure", "value")]
+)
+def update_growth(start_date, end_date, measure):
+    if not start_date or not end_date:
+        return go.Figure(), go.Figure(), go.Figure(), "No snapshots yet. Run insert_tags.py to record one."
+    if start_date >= end_date:
+        return go.Figure(), go.Figure(), go.Figure(), "Pick an end snapshot after the start snapshot."
+
+    risers, fallers = data_fetcher_growth.fetch_risers_and_fallers(start_date, end_date, by=measure)
+    if risers.empty:
+        return go.Figure(), go.Figure(), go.Figure(), "No tags to rank between these snapshots."
+
+    history = data_fetcher_growth.fetch_count_history(list(risers["tag_id"]) + list(fallers["tag_id"]))
+    history_fig = go.Figure()
+    # tag_name is a categorical over every tag; only the tags present get a trace
+    for tag_name, counts in history.groupby("tag_name", sort=False, observed=True):
+        history_fig.add_trace(go.Scatter(x=counts["snapshot_date"], y=counts["count"], mode="lines+markers", name=tag_name))
+    history_fig.update_layout(
+        title="Question Count per Snapshot",
+        xaxis_title="Snapshot",
+        yaxis_title="Questions",
+        margin=dict(t=50, b=30)
+    )
+
+    return (ranking_figure(risers, measure, "Risers", "#00CC96"),
+            ranking_figure(fallers, measure, "Fallers", "#EF553B"),
+            history_fig,
+            f"Comparing {start_date} with {end_date}.")
+
+# Run the server
+if __name__ == "__main__":
+    logger.info("Starting Dash server for Tag Growth.")
+    app.run_server(debug=True)
+    logger.info("Dash server for Tag Growth is running.")
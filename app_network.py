@@ -0,0 +1,139 @@
+# app_network.py
+
+import dash
+from dash import dcc, html, Input, Output
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+import numpy as np
+import logging
+import data_fetcher_network  # Import the network layout fetcher
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Initialize Dash app with Bootstrap
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app.title = "Co-tagging Networks"
+logger.info("Dash app initialized for Co-tagging Networks.")
+
+# Layout with description, disclaimer, and the network graph
+app.layout = dbc.Container([
+    # Title and Description Section
+    html.Div([
+        html.H1("Co-tagging Networks", className="display-4 text-center my-4"),
+
+        dbc.Container([
+            dbc.Row([
+                dbc.Col([
+                    html.P("This dashboard shows which tags are used together across the Stack Exchange network. "
+                           "Each point is a tag and each line links two tags that appear on the same questions.",
+                           className="lead"),
+
+                    html.P("How to Use:", className="font-weight-bold mt-4"),
+                    html.Ul([
+                        html.Li("Pick a Stack Exchange site from the dropdown."),
+                        html.Li("The overview shows the strongest connections; zoom in to reveal every connection in view."),
+                        html.Li("Hover over a point to see the tag and how often it is used together with other tags."),
+                        html.Li("Double-click the chart to return to the overview.")
+                    ]),
+
+                    html.P("Disclaimer: Layouts are precomputed from the co-tagging networks in the sx/ datasets and show a "
+                           "pruned backbone of each network. Tags are identified by their dataset id.",
+                           className="text-muted mt-4")
+                ], width=10),
+            ], justify="center")
+        ], className="mb-4")
+    ]),
+
+    dbc.Row([
+        dbc.Col([
+            dcc.Dropdown(
+                id="site-search",
+                options=[{"label": site, "value": site} for site in data_fetcher_network.get_all_sites()],
+                placeholder="Search sites...",
+                style={"width": "100%"},
+                className="mb-3"
+            ),
+            html.Div(id="network-info", className="text-muted")
+        ], width=6)
+    ], justify="center"),
+
+    dcc.Loading(
+        id="loading-spinner",
+        type="circle",
+        children=[
+            dcc.Graph(id="network-graph", style={"height": "80vh"})
+        ]
+    )
+], fluid=True)
+
+
+def viewport(relayout_data):
+    """Extract the zoomed axis ranges from relayoutData, or None for the full view."""
+    if not relayout_data or "xaxis.range[0]" not in relayout_data or "yaxis.range[0]" not in relayout_data:
+        return None, None
+    return ((relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]),
+            (relayout_data["yaxis.range[0]"], relayout_data["yaxis.range[1]"]))
+
+
+# Callback to draw the network, refining the level of detail on zoom
+@app.callback(
+    [Output("network-graph", "figure"), Output("network-info", "children")],
+    [Input("site-search", "value"), Input("network-graph", "relayoutData")]
+)
+def update_network(site, relayout_data):
+    if not site:
+        return go.Figure(), ""
+
+    # A new site always starts from the overview
+    if dash.callback_context.triggered_id == "site-search":
+        relayout_data = None
+    elif relayout_data and not any(key.startswith(("xaxis", "yaxis", "autosize")) for key in relayout_data):
+        return dash.no_update, dash.no_update  # Hover/selection changes need no new data
+
+    x_range, y_range = viewport(relayout_data)
+    view = data_fetcher_network.fetch_network_view(site, x_range, y_range)
+    if view is None:
+        return go.Figure(), f"No layout available for {site}."
+
+    fig = go.Figure([
+        go.Scattergl(
+            x=view["edge_x"], y=view["edge_y"],
+            mode="lines",
+            line=dict(width=0.5, color="rgba(120, 120, 120, 0.35)"),
+            hoverinfo="skip",
+            showlegend=False
+        ),
+        go.Scattergl(
+            x=view["node_x"], y=view["node_y"],
+            mode="markers",
+            marker=dict(
+                size=3 + 2 * np.log1p(view["node_weight"]),
+                color=np.log1p(view["node_weight"]),
+                colorscale="Viridis",
+                line=dict(width=0)
+            ),
+            customdata=np.column_stack([view["node_tag"], view["node_weight"]]),
+            hovertemplate="Tag %{customdata[0]}<br>Co-tag count: %{customdata[1]}<extra></extra>",
+            showlegend=False
+        )
+    ])
+
+    fig.update_layout(
+        margin=dict(t=0, l=0, r=0, b=0),
+        xaxis=dict(visible=False, range=list(x_range) if x_range else None),
+        yaxis=dict(visible=False, range=list(y_range) if y_range else None, scaleanchor="x"),
+        uirevision=site,  # Keep the user's zoom while detail is refined
+        plot_bgcolor="white"
+    )
+
+    info = (f"Showing {len(view['node_x'])} tags and {view['shown_edges']} of {view['backbone_edges']} backbone edges "
+            f"({view['total_edges']} edges in the full network).")
+    return fig, info
+
+# Run the server
+if __name__ == "__main__":
+    logger.info("Starting Dash server for Co-tagging Networks.")
+    app.run_server(debug=True)
+    logger.info("Dash server for Co-tagging Networks is running.")
@@ -1,18 +1,23 @@
 # app_tree.py
 
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, DiskcacheManager
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import logging
+from single_flight import cache  # Shared diskcache for background callbacks
 import data_fetcher_tree  # Import the tree data fetcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Slow queries run as background callbacks so they don't hold up the web server
+background_callback_manager = DiskcacheManager(cache)
+
 # Initialize Dash app with Bootstrap
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP],
+                background_callback_manager=background_callback_manager)
 app.title = "Collapsible Tree Dashboard"
 logger.info("Dash app initialized for Collapsible Tree.")
 
@@ -31,15 +36,16 @@ app.layout = dbc.Container([
                     html.P("Each collective (e.g., 'Mobile Development') is represented as a top-level block. Clicking on a collective "
                            "expands it to show associated tags (e.g., 'android', 'ios'). Clicking on a tag reveals additional question "
                            "statistics, including total questions, top and least voted question scores, and median statistics for votes "
-                           "and answer counts.",
+                           "and answer counts, along with the tags most often used together with it.",
                            className="mb-4"),
                     
                     html.P("Interaction Guide:", className="font-weight-bold"),
                     html.Ul([
                         html.Li("Hover over a segment to see the label and value."),
                         html.Li("Click on a collective to expand it and reveal tags."),
-                        html.Li("Click on a tag to see detailed question statistics in a bar chart below."),
-                        html.Li("The chart is interactive and updates automatically as you explore.")
+                        html.Li("Click on a tag to see detailed question statistics and its most related tags in bar charts below."),
+                        html.Li("The chart is interactive and updates automatically as you explore."),
+                        html.Li("Use the filter below the chart to list the top questions for a combination of tags.")
                     ], className="mb-4"),
                     
                     html.P("Disclaimer: This chart was generated with the assistance of ChatGPT and may not meet all accessibility standards. "
@@ -50,6 +56,12 @@ app.layout = dbc.Container([
         ])
     ], className="mb-4"),
 
+    # Optional date range for the tag statistics; the partitions outside it are not scanned
+    dbc.Container([
+        html.Label("Limit tag statistics to questions created between:", className="me-2"),
+        dcc.DatePickerRange(id="stats-date-range", clearable=True, className="mb-3")
+    ]),
+
     # Tree Visualization with Loading Spinner
     dbc.Container([
         dcc.Loading(
@@ -61,13 +73,32 @@ app.layout = dbc.Container([
             ],
             fullscreen=True  # Show spinner over full content
         )
+    ]),
+
+    # Multi-tag question filter, answered from the in-memory tag index
+    dbc.Container([
+        html.H4("Find Questions by Tags", className="mt-5"),
+        html.P("Combine tags with AND, OR, NOT and parentheses, e.g. 'python AND pandas AND NOT numpy'. "
+               "Tags written next to each other must all be present.",
+               className="text-muted"),
+        dbc.Row([
+            dbc.Col(dbc.Input(id="tag-filter-input", placeholder="python AND pandas AND NOT numpy", type="text"), width=6),
+            dbc.Col(dbc.Select(
+                id="tag-filter-order",
+                options=[{"label": "Top score", "value": "score"}, {"label": "Most viewed", "value": "view_count"}],
+                value="score"
+            ), width=2),
+            dbc.Col(dbc.Button("Filter", id="tag-filter-button", color="primary"), width="auto")
+        ], className="mb-3"),
+        html.Div(id="tag-filter-results", className="mb-5")
     ])
 ], fluid=True)
 
 # Callback to generate the collapsible tree chart
 @app.callback(
     Output("collapsible-tree", "figure"),
-    Input("collapsible-tree", "id")
+    Input("collapsible-tree", "id"),
+    background=True  # Runs in a worker process via the diskcache manager
 )
 def update_collapsible_tree(_):
     logger.info("Updating Collapsible Tree chart.")
@@ -118,15 +149,20 @@ def update_collapsible_tree(_):
 # Callback for displaying additional information on click
 @app.callback(
     Output("tree-info", "children"),
-    Input("collapsible-tree", "clickData")
+    [Input("collapsible-tree", "clickData"),
+     Input("stats-date-range", "start_date"), Input("stats-date-range", "end_date")]
 )
-def display_tree_info(clickData):
+def display_tree_info(clickData, start_date, end_date):
     if clickData:
         point = clickData['points'][0]
         label = point['label']
         
         # Fetch statistics if the selected item is a tag
-        statistics = data_fetcher_tree.fetch_tag_statistics(label)
+        # Only a complete range narrows the statistics
+        if not (start_date and end_date):
+            start_date = end_date = None
+        statistics = data_fetcher_tree.fetch_tag_statistics(label, start_date, end_date)
+        graphs = []
         if statistics:
             # Create a bar chart for the statistics
             fig = go.Figure(data=[
@@ -152,21 +188,80 @@ def display_tree_info(clickData):
             ])
 
             fig.update_layout(
-                title=f"Statistics for '{label}'",
+                title=f"Statistics for '{label}'" + (f" ({start_date} to {end_date})" if start_date else ""),
                 xaxis_title="Statistics",
                 yaxis_title="Values",
                 margin=dict(t=50, b=30)
             )
 
-            return dcc.Graph(figure=fig)
+            graphs.append(dcc.Graph(figure=fig))
 
-        else:
-            # If no data available, display a message
-            return html.Div(f"No additional data available for {label}.")
+        # Related tags don't depend on the statistics, so they are shown even when
+        # the date range leaves no questions to summarize
+        related = data_fetcher_tree.fetch_related_tags(label)
+        if not related.empty:
+            related_fig = go.Figure(data=[
+                go.Bar(
+                    x=related["count"][::-1],
+                    y=related["tag_name"][::-1],
+                    orientation="h",
+                    marker=dict(color="#19D3F3"),
+                    text=related["count"][::-1],
+                    textposition="auto"
+                )
+            ])
+            related_fig.update_layout(
+                title=f"Tags Most Often Used With '{label}'",
+                xaxis_title="Questions Tagged With Both",
+                margin=dict(t=50, b=30)
+            )
+            graphs.append(dcc.Graph(figure=related_fig))
+
+        if graphs:
+            return html.Div(graphs)
+
+        # If no data available, display a message
+        return html.Div(f"No additional data available for {label}.")
 
     # Default message if no item is selected
     return html.Div("Click on a segment to view details")
 
+# Callback for the multi-tag question filter
+@app.callback(
+    Output("tag-filter-results", "children"),
+    [Input("tag-filter-button", "n_clicks"), Input("tag-filter-input", "n_submit")],
+    [State("tag-filter-input", "value"), State("tag-filter-order", "value")],
+    prevent_initial_call=True
+)
+def filter_questions(_clicks, _submits, expression, order_by):
+    if not expression:
+        return html.Div("Enter a tag expression to search.", className="text-muted")
+
+    try:
+        total, questions = data_fetcher_tree.fetch_tagged_questions(expression, order_by)
+    except ValueError as e:
+        return dbc.Alert(f"Could not read the expression: {e}", color="warning")
+
+    if questions.empty:
+        return html.Div(f"No questions match '{expression}'.")
+
+    rows = [
+        html.Tr([
+            html.Td(html.A(question["title"], href=question["link"], target="_blank")
+                    if isinstance(question["link"], str) else int(question["question_id"])),
+            html.Td(int(question["score"])),
+            html.Td(int(question["view_count"]))
+        ])
+        for _, question in questions.iterrows()
+    ]
+    return html.Div([
+        html.P(f"{total} questions match; showing the top {len(questions)}.", className="text-muted"),
+        dbc.Table([
+            html.Thead(html.Tr([html.Th("Question"), html.Th("Score"), html.Th("Views")])),
+            html.Tbody(rows)
+        ], striped=True, hover=True, size="sm")
+    ])
+
 # Run the server
 if __name__ == "__main__":
     logger.info("Starting Dash server for Collapsible Tree.")
@@ -1,22 +1,29 @@
 # app_trend.py
 
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, ClientsideFunction, DiskcacheManager
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
 import logging
+from single_flight import cache  # Shared diskcache for background callbacks
 import data_fetcher_trend  # Import the updated data fetching module
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Slow queries run as background callbacks so they don't hold up the web server
+background_callback_manager = DiskcacheManager(cache)
+
 # Initialize Dash app with Bootstrap
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP],
+                background_callback_manager=background_callback_manager)
 app.title = "Collective Popularity Trends"
 
+# Full date window loaded into the browser; narrowing within it happens clientside
+TREND_START_DATE = "2021-01-01"
+TREND_END_DATE = "2023-12-31"
+
 # Layout with description, disclaimer, and graph elements
 app.layout = dbc.Container([
     # Title and Description Section
@@ -59,12 +66,13 @@ app.layout = dbc.Container([
             ),
             dcc.DatePickerRange(
                 id="date-range",
-                min_date_allowed=pd.to_datetime("2021-01-01"),
-                max_date_allowed=pd.to_datetime("2023-12-31"),
-                start_date=pd.to_datetime("2021-01-01"),
-                end_date=pd.to_datetime("2023-12-31"),
+                min_date_allowed=pd.to_datetime(TREND_START_DATE),
+                max_date_allowed=pd.to_datetime(TREND_END_DATE),
+                start_date=pd.to_datetime(TREND_START_DATE),
+                end_date=pd.to_datetime(TREND_END_DATE),
                 className="mb-3"
             ),
+            dcc.Checklist(id="tag-toggle", inline=True, inputStyle={"marginRight": "4px", "marginLeft": "10px"}),
             html.Div(id="collective-limit-warning", className="text-danger mt-2")
         ], width=6)
     ], justify="center"),
@@ -74,56 +82,68 @@ app.layout = dbc.Container([
         id="loading-spinner",
         type="circle",
         children=[
+            dcc.Store(id="trend-store"),  # Columnar trend data shared with the clientside callbacks
             dcc.Graph(id="streamgraph")
         ],
         fullscreen=True
     )
 ], fluid=True)
 
-# Callback to update the streamgraph based on selected collectives and date range
+# Callback to load trend data; the server is only hit when the selected collectives change
 @app.callback(
-    [Output("streamgraph", "figure"), Output("collective-limit-warning", "children")],
-    [Input("collective-search", "value"), Input("date-range", "start_date"), Input("date-range", "end_date")]
+    [Output("trend-store", "data"), Output("collective-limit-warning", "children")],
+    Input("collective-search", "value"),
+    background=True  # Runs in a worker process via the diskcache manager
 )
-def update_streamgraph(selected_collectives, start_date, end_date):
+def update_trend_store(selected_collectives):
     # Check if the selected collectives exceed the limit of 7
     if selected_collectives and len(selected_collectives) > 7:
         warning_msg = "You can select up to 7 collectives only. Please reduce your selection."
-        return go.Figure(), warning_msg
+        return None, warning_msg
 
     if not selected_collectives:
-        return go.Figure(), ""  # Return an empty figure if no collectives are selected
+        return None, ""  # Clear the store if no collectives are selected
+
+    # Fetch the full date window once, with enough timestamps that the browser can
+    # narrow the date range and downsample each range to MAX_POINTS_PER_TRACE itself
+    data = data_fetcher_trend.fetch_trend_data(selected_collectives, TREND_START_DATE, TREND_END_DATE,
+                                               max_points=data_fetcher_trend.STORE_POINTS_PER_TRACE)
 
-    # Fetch data based on selected collectives and date range
-    data = data_fetcher_trend.fetch_trend_data(selected_collectives, start_date, end_date)
-    
     # Log the data passed to the graph
     if data.empty:
         logger.warning("No data available for the selected collectives and date range.")
-    else:
-        logger.info("Data for streamgraph:")
-        logger.info(data.head())
+        return None, ""
 
-    # Return an empty figure if there's no data
-    if data.empty:
-        return go.Figure(), ""
-
-    # Prepare the streamgraph using Plotly's area chart
-    fig = px.area(
-        data,
-        x="creation_date",
-        y="question_count",
-        color="tag",
-        title="Tag Popularity Over Time",
-        line_group="tag"
-    )
-    
-    fig.update_layout(
-        margin=dict(t=0, l=0, r=0, b=0),
-        xaxis_title="Creation Date",
-        yaxis_title="Question Count",
-    )
-    return fig, ""  # Return the figure with no warning message if the collective limit is within range
+    logger.info("Data for streamgraph:")
+    logger.info(data.head())
+
+    # Columnar layout with tags and dates dictionary-encoded
+    tag_codes, tags = pd.factorize(data["tag"])
+    date_codes, dates = pd.factorize(pd.to_datetime(data["creation_date"]).dt.strftime("%Y-%m-%dT%H:%M:%S"))
+    store = {
+        "tags": tags.tolist(),
+        "dates": dates.tolist(),
+        "tag": tag_codes.tolist(),
+        "date": date_codes.tolist(),
+        "count": data["question_count"].tolist(),
+        "max_points": data_fetcher_trend.MAX_POINTS_PER_TRACE
+    }
+    return store, ""  # Return the data with no warning message if the collective limit is within range
+
+# Populate the tag toggles whenever new data arrives
+app.clientside_callback(
+    ClientsideFunction(namespace="trend", function_name="tag_options"),
+    [Output("tag-toggle", "options"), Output("tag-toggle", "value")],
+    Input("trend-store", "data")
+)
+
+# Build the streamgraph in the browser for the selected date range and tags
+app.clientside_callback(
+    ClientsideFunction(namespace="trend", function_name="build_figure"),
+    Output("streamgraph", "figure"),
+    [Input("trend-store", "data"), Input("date-range", "start_date"),
+     Input("date-range", "end_date"), Input("tag-toggle", "value")]
+)
 
 if __name__ == "__main__":
     app.run_server(debug=True)
@@ -0,0 +1,209 @@
+// clientside.js
+//
+// Clientside callbacks for the sunburst and trend dashboards. The server ships
+// one columnar dataset into a dcc.Store; everything below rebuilds figures and
+// details from that store in the browser without a round trip.
+
+// Largest-Triangle-Three-Buckets, as lttb_indices in data_fetcher_trend.py:
+// return the indices of nOut points of (x, y), keeping the first and last.
+function lttbIndices(x, y, nOut) {
+    var n = x.length, i;
+    if (nOut >= n || nOut < 3) {
+        var all = [];
+        for (i = 0; i < n; i++) {
+            all.push(i);
+        }
+        return all;
+    }
+
+    var edges = [];
+    for (i = 0; i < nOut - 1; i++) {
+        edges.push(Math.floor(1 + i * (n - 2) / (nOut - 2)));
+    }
+    var selected = [0], previous = 0;
+    for (var bucket = 0; bucket < nOut - 2; bucket++) {
+        var start = edges[bucket], end = edges[bucket + 1];
+        // Average of the next bucket; the last bucket looks ahead to the final point
+        var nextX = x[n - 1], nextY = y[n - 1];
+        if (bucket < nOut - 3) {
+            var sumX = 0, sumY = 0, stop = edges[bucket + 2];
+            for (i = end; i < stop; i++) {
+                sumX += x[i];
+                sumY += y[i];
+            }
+            nextX = sumX / (stop - end);
+            nextY = sumY / (stop - end);
+        }
+        var best = start, bestArea = -1;
+        for (i = start; i < end; i++) {
+            var area = Math.abs((x[previous] - nextX) * (y[i] - y[previous])
+                                - (x[previous] - x[i]) * (nextY - y[previous]));
+            if (area > bestArea) {
+                best = i;
+                bestArea = area;
+            }
+        }
+        previous = best;
+        selected.push(best);
+    }
+    selected.push(n - 1);
+    return selected;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    sunburst: {
+        // Build the sunburst figure from the columnar store
+        build_figure: function (store) {
+            if (!store || !store.name.length) {
+                return {data: [], layout: {}};
+            }
+
+            var ids = [], labels = [], parents = [], values = [], colors = [];
+            var totals = {};
+
+            // Leaves: one per (collective, tag) row
+            for (var i = 0; i < store.name.length; i++) {
+                var collective = store.collectives[store.collective[i]];
+                ids.push(collective + "/" + store.name[i]);
+                labels.push(store.name[i]);
+                parents.push(collective);
+                values.push(store.tag_count[i]);
+                colors.push(store.colors[collective]);
+                totals[collective] = store.collective_total_count[i];
+            }
+
+            // Inner ring: one per collective
+            store.collectives.forEach(function (collective) {
+                ids.push(collective);
+                labels.push(collective);
+                parents.push("");
+                values.push(totals[collective] || 0);
+                colors.push(store.colors[collective]);
+            });
+
+            return {
+                data: [{
+                    type: "sunburst",
+                    ids: ids,
+                    labels: labels,
+                    parents: parents,
+                    values: values,
+                    branchvalues: "total",
+                    marker: {colors: colors}
+                }],
+                layout: {margin: {t: 0, l: 0, r: 0, b: 0}}
+            };
+        },
+
+        // Format the clicked segment's details
+        display_info: function (clickData, store) {
+            if (!clickData) {
+                return "Click on a segment to view details";
+            }
+            var point = clickData.points[0];
+            var lines = [
+                {namespace: "dash_html_components", type: "P", props: {children: "Selected: " + point.label}},
+                {namespace: "dash_html_components", type: "P", props: {
+                    children: "Tag Count: " + (point.value !== undefined ? point.value : "N/A")
+                }}
+            ];
+            if (point.parent && store) {
+                // Tags carry their collective's total alongside their own count
+                var total = 0;
+                var collectiveIdx = store.collectives.indexOf(point.parent);
+                for (var i = 0; i < store.collective.length; i++) {
+                    if (store.collective[i] === collectiveIdx) {
+                        total = store.collective_total_count[i];
+                        break;
+                    }
+                }
+                lines.push({namespace: "dash_html_components", type: "P", props: {children: "Collective: " + point.parent}});
+                if (total > 0) {
+                    lines.push({namespace: "dash_html_components", type: "P", props: {
+                        children: "Share of Collective: " + (100 * point.value / total).toFixed(1) + "%"
+                    }});
+                }
+            }
+            return {namespace: "dash_html_components", type: "Div", props: {children: [
+                {namespace: "dash_html_components", type: "H4", props: {children: "Selected Details"}}
+            ].concat(lines)}};
+        }
+    },
+
+    trend: {
+        // Offer every tag in the store for toggling, all switched on
+        tag_options: function (store) {
+            if (!store) {
+                return [[], []];
+            }
+            var options = store.tags.map(function (tag) {
+                return {label: tag, value: tag};
+            });
+            return [options, store.tags.slice()];
+        },
+
+        // Build the streamgraph for the selected date range and tags. The store
+        // holds the full window; the range is downsampled to store.max_points
+        // timestamps with LTTB on the stacked total, so narrow ranges keep detail.
+        build_figure: function (store, startDate, endDate, selectedTags) {
+            if (!store || !store.count.length) {
+                return {data: [], layout: {}};
+            }
+            var start = startDate ? startDate.slice(0, 10) : "0000-01-01";
+            var end = endDate ? endDate.slice(0, 10) : "9999-12-31";
+            var visible = {};
+            (selectedTags || []).forEach(function (tag) {
+                visible[tag] = true;
+            });
+
+            // Stacked total of the visible tags per date inside the range
+            var totals = {}, i, tag, day;
+            for (i = 0; i < store.count.length; i++) {
+                day = store.dates[store.date[i]].slice(0, 10);
+                if (visible[store.tags[store.tag[i]]] && day >= start && day <= end) {
+                    totals[store.date[i]] = (totals[store.date[i]] || 0) + store.count[i];
+                }
+            }
+            var codes = Object.keys(totals).map(Number).sort(function (a, b) {
+                return store.dates[a] < store.dates[b] ? -1 : store.dates[a] > store.dates[b] ? 1 : 0;
+            });
+            var x = codes.map(function (code) { return Date.parse(store.dates[code] + "Z"); });
+            var y = codes.map(function (code) { return totals[code]; });
+            var kept = {};
+            lttbIndices(x, y, store.max_points || codes.length).forEach(function (index) {
+                kept[codes[index]] = true;
+            });
+
+            // One stacked area trace per tag, in first-seen order
+            var traces = {}, order = [];
+            for (i = 0; i < store.count.length; i++) {
+                tag = store.tags[store.tag[i]];
+                var date = store.dates[store.date[i]];
+                if (!visible[tag] || !kept[store.date[i]]) {
+                    continue;
+                }
+                if (!traces[tag]) {
+                    traces[tag] = {
+                        type: "scatter", mode: "lines", stackgroup: "one",
+                        name: tag, legendgroup: tag, x: [], y: [],
+                        hovertemplate: "tag=" + tag + "<br>creation_date=%{x}<br>question_count=%{y}<extra></extra>"
+                    };
+                    order.push(tag);
+                }
+                traces[tag].x.push(date);
+                traces[tag].y.push(store.count[i]);
+            }
+
+            return {
+                data: order.map(function (tag) { return traces[tag]; }),
+                layout: {
+                    title: {text: "Tag Popularity Over Time"},
+                    margin: {t: 0, l: 0, r: 0, b: 0},
+                    xaxis: {title: {text: "Creation Date"}},
+                    yaxis: {title: {text: "Question Count"}},
+                    legend: {title: {text: "tag"}}
+                }
+            };
+        }
+    }
+});
@@ -0,0 +1,207 @@
+# benchmark_backends.py
+#
+# Compares the Postgres and DuckDB backends of db_backend on synthetic data.
+# For each scale it fills a scratch Postgres schema, exports it to Parquet,
+# then times the sunburst, trend and tag-statistics fetchers on both backends.
+# The report is printed and written to benchmarks/backend_benchmark.md.
+# Scratch schemas and exports are removed afterwards.
+#
+#   python benchmark_backends.py 100000 1000000 10000000
+
+import os
+import sys
+import time
+import shutil
+import statistics
+import tempfile
+from datetime import datetime
+
+import psycopg2
+
+import db_backend
+import single_flight
+import data_fetcher
+import data_fetcher_tree
+import data_fetcher_trend
+
+# Database connection parameters
+DB_NAME = "550_1"
+DB_USER = "postgres"
+DB_PASSWORD = "postgres"
+DB_HOST = "localhost"
+DB_PORT = "5432"
+
+DEFAULT_SCALES = [100_000, 1_000_000, 10_000_000]
+NUM_TAGS = 10000
+NUM_COLLECTIVES = 20
+COLLECTIVE_TAGS = 600  # The most popular tags belong to a collective
+TAGS_PER_QUESTION = 3
+REPEATS = 5
+
+# Tracked with the code, unlike data/
+REPORT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "backend_benchmark.md")
+
+SCHEMA = """
+CREATE TABLE tags (
+    tag_id integer PRIMARY KEY,
+    name varchar(255) NOT NULL UNIQUE,
+    count integer
+);
+CREATE TABLE collectives (
+    collective_id integer PRIMARY KEY,
+    collective_name varchar(255) NOT NULL UNIQUE
+);
+CREATE TABLE tag_collectives (
+    tag_id integer REFERENCES tags (tag_id),
+    collective_id integer REFERENCES collectives (collective_id),
+    PRIMARY KEY (tag_id, collective_id)
+);
+CREATE TABLE topvotedquestions (
+    question_id integer PRIMARY KEY,
+    view_count integer,
+    is_answered boolean,
+    answer_count integer,
+    score integer,
+    creation_date timestamp without time zone,
+    link text,
+    title text
+);
+CREATE TABLE questiontags (
+    question_id integer NOT NULL REFERENCES topvotedquestions (question_id),
+    tag_id integer NOT NULL REFERENCES tags (tag_id),
+    PRIMARY KEY (question_id, tag_id)
+);
+"""
+
+# Questions spread evenly from August 2008 to the end of 2023; tag use is
+# skewed so a few tags are very popular, as on the real site
+SYNTHETIC_DATA = """
+INSERT INTO tags
+SELECT i, 'tag-' || i, (2500000 / power(i, 1.1))::integer FROM generate_series(1, {num_tags}) AS i;
+
+INSERT INTO collectives
+SELECT i, 'Collective ' || i FROM generate_series(1, {num_collectives}) AS i;
+
+INSERT INTO tag_collectives
+SELECT i, 1 + i % {num_collectives} FROM generate_series(1, {collective_tags}) AS i;
+
+INSERT INTO topvotedquestions
+SELECT i,
+       (random() * 100000)::integer,
+       random() < 0.8,
+       (random() * 10)::integer,
+       (10000 * power(random(), 8))::integer,
+       timestamp '2008-08-01' + (i::double precision / {rows}) * (timestamp '2023-12-31' - timestamp '2008-08-01'),
+       'https://stackoverflow.com/q/' || i,
+       'Synthetic question ' || i
+FROM generate_series(1, {rows}) AS i;
+
+INSERT INTO questiontags
+SELECT q, 1 + floor({num_tags} * power(random(), 3))::integer
+FROM generate_series(1, {rows}) AS q, generate_series(1, {tags_per_question})
+ON CONFLICT DO NOTHING;
+
+CREATE INDEX idx_questiontags_tag_question ON questiontags USING btree (tag_id, question_id);
+CREATE INDEX idx_topvotedquestions_creation_date ON topvotedquestions USING btree (creation_date);
+"""
+
+QUERIES = {
+    "fetch_sunburst_data": lambda: data_fetcher.fetch_sunburst_data(),
+    "fetch_trend_data (2 collectives, 3 years)": lambda: data_fetcher_trend.fetch_trend_data(
+        ["Collective 1", "Collective 2"], "2021-01-01", "2023-12-31"),
+    "fetch_tag_statistics (1 tag, all years)": lambda: data_fetcher_tree.fetch_tag_statistics("tag-100"),
+    "fetch_tag_statistics (1 tag, 1 year)": lambda: data_fetcher_tree.fetch_tag_statistics(
+        "tag-100", "2021-01-01", "2021-12-31"),
+}
+
+
+def log_and_print(message):
+    """Print progress messages with timestamps."""
+    print(f"{datetime.now()} - {message}")
+
+
+def build_schema(cursor, schema, rows):
+    """Create a scratch schema holding the five tables filled with synthetic data."""
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+    cursor.execute(f"SET search_path TO {schema}")
+    cursor.execute(SCHEMA)
+    cursor.execute(SYNTHETIC_DATA.format(num_tags=NUM_TAGS, num_collectives=NUM_COLLECTIVES,
+                                         collective_tags=COLLECTIVE_TAGS, rows=rows,
+                                         tags_per_question=TAGS_PER_QUESTION))
+    cursor.execute("VACUUM ANALYZE")
+
+
+def measure(fetch):
+    """Return the first-call and median warm latency (ms) of a fetcher."""
+    timings = []
+    for _ in range(REPEATS + 1):
+        started = time.perf_counter()
+        fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings[0], statistics.median(timings[1:])
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SCALES
+    # Every call must reach the backend, not a coalesced result
+    single_flight.SINGLE_FLIGHT_ENABLED = False
+
+    connection = psycopg2.connect(dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT)
+    connection.autocommit = True
+    cursor = connection.cursor()
+
+    report = [
+        "# Backend Benchmark",
+        "",
+        f"Generated by `benchmark_backends.py` on {datetime.now():%Y-%m-%d %H:%M}.",
+        f"Synthetic data: {NUM_TAGS} tags ({COLLECTIVE_TAGS} in {NUM_COLLECTIVES} collectives), up to "
+        f"{TAGS_PER_QUESTION} tags per question. Cold is the first call; warm is the median of {REPEATS} "
+        "further calls. Times include building the DataFrame the dashboards use.",
+        "",
+    ]
+    try:
+        for rows in scales:
+            schema = f"bench_backends_{rows}"
+            export_dir = tempfile.mkdtemp(prefix="soti_export_")
+            log_and_print(f"Building schema with {rows:,} questions.")
+            build_schema(cursor, schema, rows)
+            try:
+                db_backend.configure(backend="postgres", engine_url=db_backend.DATABASE_URL,
+                                     connect_args={"options": f"-csearch_path={schema}"})
+                db_backend.export_tables(export_dir)
+                export_size = sum(os.path.getsize(os.path.join(export_dir, name)) for name in os.listdir(export_dir))
+
+                results = {}
+                for backend in ("postgres", "duckdb"):
+                    db_backend.configure(backend=backend, export_dir=export_dir)
+                    for name, fetch in QUERIES.items():
+                        log_and_print(f"Measuring {name} on {backend}.")
+                        results[(backend, name)] = measure(fetch)
+            finally:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+                shutil.rmtree(export_dir, ignore_errors=True)
+
+            report += [
+                f"## {rows:,} questions", "",
+                f"Parquet export: {export_size / 2**20:.1f} MiB.", "",
+                "| Query | Postgres cold (ms) | Postgres warm (ms) | DuckDB cold (ms) | DuckDB warm (ms) |",
+                "|---|---|---|---|---|"
+            ]
+            for name in QUERIES:
+                postgres, duckdb = results[("postgres", name)], results[("duckdb", name)]
+                report.append(f"| {name} | {postgres[0]:.1f} | {postgres[1]:.1f} | {duckdb[0]:.1f} | {duckdb[1]:.1f} |")
+            report.append("")
+    finally:
+        cursor.close()
+        connection.close()
+
+    print("\n".join(report))
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, "w") as file:
+        file.write("\n".join(report))
+    log_and_print(f"Report written to {REPORT_FILE}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# build_network_layouts.py
+#
+# Offline layout stage for the co-tagging networks in sx/. Large sites have
+# hundreds of thousands of edges, far too many to lay out in the browser. For
+# each site this script
+#   1. prunes the network to a backbone: every tag's strongest edges plus the
+#      heaviest edges overall,
+#   2. computes node positions with a sparse spectral layout of each connected
+#      component, then packs the components side by side, and
+#   3. caches the result as compact arrays in LAYOUT_DIR/<site>.npz. Edges are
+#      sorted by weight, so any prefix is a level of detail.
+#
+#   python build_network_layouts.py            # all sites
+#   python build_network_layouts.py ai gaming  # selected sites
+
+import os
+import sys
+import logging
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import eigsh
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+NETWORKS_DIR = os.path.join("sx", "sx-cotagging-networks", "networks")
+LAYOUT_DIR = os.path.join("data", "network_layouts")
+
+EDGES_PER_NODE = 3  # Strongest edges kept for every tag
+MAX_BACKBONE_EDGES = 50000  # Heaviest edges kept overall
+DENSE_EIGEN_LIMIT = 64  # Components up to this size use a dense eigensolver
+
+
+def load_network(site):
+    """Read a site's co-tagging edge list (t1, t2, ct)."""
+    path = os.path.join(NETWORKS_DIR, f"{site}_cotagging.csv")
+    return pd.read_csv(path, index_col=0, dtype={"t1": np.int32, "t2": np.int32, "ct": np.int32})
+
+
+def prune_backbone(edges):
+    """Keep each node's EDGES_PER_NODE strongest edges plus the MAX_BACKBONE_EDGES heaviest overall."""
+    # Rank every edge within both of its endpoints' neighbourhoods
+    both_ends = pd.DataFrame({
+        "edge": np.concatenate([edges.index.to_numpy(), edges.index.to_numpy()]),
+        "node": np.concatenate([edges["t1"].to_numpy(), edges["t2"].to_numpy()]),
+        "ct": np.concatenate([edges["ct"].to_numpy(), edges["ct"].to_numpy()])
+    })
+    rank = both_ends.groupby("node")["ct"].rank(method="first", ascending=False)
+    local = both_ends.loc[rank <= EDGES_PER_NODE, "edge"].unique()
+    heaviest = edges["ct"].nlargest(MAX_BACKBONE_EDGES).index
+    return edges.loc[np.union1d(local, heaviest)]
+
+
+def spectral_positions(adjacency):
+    """2D spectral layout of one connected component.
+
+    Uses the 2nd and 3rd leading eigenvectors of the normalized adjacency
+    D^-1/2 A D^-1/2, rescaled by D^-1/2 (random-walk coordinates).
+    """
+    n = adjacency.shape[0]
+    if n <= 2:
+        return np.array([[-0.5, 0.0], [0.5, 0.0]][:n], dtype=np.float64)
+
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    scale = sparse.diags(1.0 / np.sqrt(degree))
+    normalized = scale @ adjacency @ scale
+
+    k = min(3, n - 1)
+    if n <= DENSE_EIGEN_LIMIT:
+        _, vectors = np.linalg.eigh(normalized.toarray())
+        vectors = vectors[:, ::-1][:, :k]
+    else:
+        start = np.random.default_rng(0).random(n)  # Fixed start vector keeps layouts reproducible
+        _, vectors = eigsh(normalized, k=k, which="LA", tol=1e-4, v0=start)
+        vectors = vectors[:, ::-1]
+
+    coords = vectors[:, 1:3] / np.sqrt(degree)[:, None]
+    if coords.shape[1] == 1:
+        coords = np.column_stack([coords[:, 0], np.zeros(n)])
+    coords -= coords.mean(axis=0)
+    extent = np.abs(coords).max()
+    return coords / extent if extent > 0 else coords
+
+
+def layout_network(edges):
+    """Lay out every component and pack them in rows, largest first, sized by node count.
+
+    Returns (node ids, positions) with positions as float32 (n, 2).
+    """
+    nodes, endpoints = np.unique(np.concatenate([edges["t1"], edges["t2"]]), return_inverse=True)
+    rows, cols = endpoints[:len(edges)], endpoints[len(edges):]
+    # Log weights keep a few very heavy pairs from collapsing the layout
+    weights = np.log1p(edges["ct"].to_numpy(dtype=np.float64))
+    adjacency = sparse.coo_matrix((weights, (rows, cols)), shape=(len(nodes), len(nodes))).tocsr()
+    adjacency = adjacency + adjacency.T
+
+    _, labels = connected_components(adjacency, directed=False)
+    sizes = np.bincount(labels)
+    members_by_component = np.split(np.argsort(labels, kind="stable"), np.cumsum(sizes)[:-1])
+    positions = np.zeros((len(nodes), 2), dtype=np.float64)
+
+    row_width = np.sqrt(len(nodes))  # Total area ~ node count, laid out roughly square
+    x, y, row_height = 0.0, 0.0, 0.0
+    for component in np.argsort(sizes)[::-1]:
+        members = members_by_component[component]
+        radius = np.sqrt(len(members)) / 2
+        coords = spectral_positions(adjacency[members][:, members]) * radius
+        if x > 0 and x + 2 * radius > row_width:
+            x, y, row_height = 0.0, y - row_height, 0.0
+        positions[members] = coords + [x + radius, y - radius]
+        x += 2 * radius * 1.1
+        row_height = max(row_height, 2 * radius * 1.1)
+
+    return nodes.astype(np.int32), positions.astype(np.float32)
+
+
+def build_layout(site):
+    """Build and cache the layout for one site."""
+    edges = load_network(site)
+    if edges.empty:
+        logger.warning(f"{site}: no edges, skipped.")
+        return site
+
+    # Weighted degree on the full network, used for node size and node LOD
+    node_weight = pd.concat([
+        edges.groupby("t1")["ct"].sum(), edges.groupby("t2")["ct"].sum()
+    ]).groupby(level=0).sum()
+
+    backbone = prune_backbone(edges).sort_values("ct", ascending=False)
+    nodes, positions = layout_network(backbone)
+
+    index = pd.Series(np.arange(len(nodes), dtype=np.int32), index=nodes)
+    np.savez_compressed(
+        os.path.join(LAYOUT_DIR, f"{site}.npz"),
+        nodes=nodes,
+        positions=positions,
+        node_weight=node_weight.reindex(nodes).to_numpy(dtype=np.int32),
+        # Edges as (source, target) rows into nodes, heaviest first
+        edges=np.column_stack([index[backbone["t1"]].to_numpy(), index[backbone["t2"]].to_numpy()]).astype(np.int32),
+        edge_weight=backbone["ct"].to_numpy(dtype=np.int32),
+        total_edges=np.int64(len(edges))
+    )
+    logger.info(f"{site}: {len(nodes)} tags, {len(backbone)} of {len(edges)} edges kept.")
+    return site
+
+
+def available_sites():
+    """Sites with a co-tagging network in NETWORKS_DIR."""
+    suffix = "_cotagging.csv"
+    return sorted(name[:-len(suffix)] for name in os.listdir(NETWORKS_DIR) if name.endswith(suffix))
+
+
+if __name__ == "__main__":
+    os.makedirs(LAYOUT_DIR, exist_ok=True)
+    sites = sys.argv[1:] or available_sites()
+    with Pool() as pool:
+        pool.map(build_layout, sites, chunksize=1)
+    logger.info(f"Layouts for {len(sites)} sites written to {LAYOUT_DIR}.")
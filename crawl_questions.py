@@ -0,0 +1,256 @@
+# crawl_questions.py
+#
+# Crawls the full Stack Overflow question history. The API stops deep paging,
+# so instead of paging one long result set the time range is cut into
+# fromdate/todate windows that are crawled by a pool of worker processes.
+# A window that still has more results after MAX_PAGES keeps what was fetched,
+# and the rest of it is queued as a new window.
+#
+# All workers share one SQLite state file. It holds each window's status, so
+# an interrupted crawl resumes with the unfinished windows. It also holds the
+# daily request budget and the API's backoff, so workers stay within the key's
+# quota together. Each finished window is written to its own gzipped JSON-lines
+# shard in OUTPUT_DIR.
+#
+# Set SE_API_ROOT to crawl a local mock server instead of the real API.
+
+import os
+import sys
+import json
+import gzip
+import time
+import sqlite3
+from datetime import datetime, timezone
+from multiprocessing import Pool
+
+import requests
+
+# Constants
+API_ROOT = os.environ.get("SE_API_ROOT", "https://api.stackexchange.com/2.3")
+BASE_URL = f"{API_ROOT}/questions"
+SITE = "stackoverflow"
+PAGE_SIZE = 100
+MAX_PAGES = 100  # Deepest page fetched per window before the rest is queued
+API_KEY = "rl_c1moaS69vnAxFksfyEy5h8y19"
+DAILY_QUOTA = 10000  # Requests per day allowed for API_KEY
+REQUEST_INTERVAL = 0.1  # Minimum seconds between requests across all workers
+REQUEST_TIMEOUT = 60
+WORKERS = 4
+
+START_DATE = datetime(2008, 7, 31, tzinfo=timezone.utc)  # First Stack Overflow question
+WINDOW_DAYS = 30  # Initial window width; busy windows are continued in further windows
+
+OUTPUT_DIR = "Question Shards"
+STATE_FILE = os.path.join(OUTPUT_DIR, "crawl_state.sqlite3")
+LOG_FILE = "log.txt"
+
+
+# Logging function
+def log_message(message):
+    with open(LOG_FILE, "a") as log_file:
+        log_file.write(message + "\n")
+    print(message)
+
+
+def connect_state():
+    """Open the shared crawl state; every process uses its own connection."""
+    connection = sqlite3.connect(STATE_FILE, timeout=60, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+
+def init_state(end_date):
+    """Create the state tables and add any missing windows up to end_date."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    state = connect_state()
+    state.execute("""
+        CREATE TABLE IF NOT EXISTS windows (
+            fromdate INTEGER NOT NULL,
+            todate INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',  -- pending, done (split in state files of older runs)
+            items INTEGER,
+            PRIMARY KEY (fromdate, todate)
+        )
+    """)
+    state.execute("""
+        CREATE TABLE IF NOT EXISTS quota (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            day TEXT NOT NULL,
+            used INTEGER NOT NULL,
+            quota_remaining INTEGER,
+            not_before REAL NOT NULL
+        )
+    """)
+    state.execute("INSERT OR IGNORE INTO quota VALUES (1, ?, 0, NULL, 0)", (utc_day(),))
+
+    # Seeded on every start, so a later end_date adds the windows past the ones
+    # already covered; INSERT OR IGNORE keeps reruns with the same end_date idempotent
+    origin = int(START_DATE.timestamp())
+    end = int(end_date.timestamp())
+    step = WINDOW_DAYS * 86400
+    covered = state.execute("SELECT MAX(todate) FROM windows").fetchone()[0]
+    start = origin if covered is None else covered + 1
+    bounds = [start] + [fromdate for fromdate in range(origin, end, step) if fromdate > start] + [end]
+    state.executemany(
+        "INSERT OR IGNORE INTO windows (fromdate, todate) VALUES (?, ?)",
+        [(fromdate, todate - 1) for fromdate, todate in zip(bounds, bounds[1:]) if fromdate < todate]
+    )
+    state.close()
+
+
+def utc_day():
+    """The API's quota resets at midnight UTC."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def acquire_request(state):
+    """Reserve one request from the shared budget.
+
+    Returns how long the caller must sleep before sending it, or None once the
+    day's budget (ours or the API's quota_remaining) is used up.
+    """
+    state.execute("BEGIN IMMEDIATE")  # Serialises the quota bookkeeping across workers
+    try:
+        day, used, quota_remaining, not_before = state.execute(
+            "SELECT day, used, quota_remaining, not_before FROM quota WHERE id = 1"
+        ).fetchone()
+        if day != utc_day():
+            day, used, quota_remaining = utc_day(), 0, None
+        if used >= DAILY_QUOTA or quota_remaining == 0:
+            state.execute("COMMIT")
+            return None
+
+        now = time.time()
+        send_at = max(now, not_before)
+        state.execute(
+            "UPDATE quota SET day = ?, used = ?, quota_remaining = ?, not_before = ? WHERE id = 1",
+            (day, used + 1, quota_remaining, send_at + REQUEST_INTERVAL)
+        )
+        state.execute("COMMIT")
+        return send_at - now
+    except Exception:
+        state.execute("ROLLBACK")
+        raise
+
+
+def record_response(state, data):
+    """Share the quota and backoff the API reported with the other workers."""
+    backoff = data.get("backoff", 0)
+    state.execute(
+        "UPDATE quota SET quota_remaining = COALESCE(?, quota_remaining), not_before = MAX(not_before, ?) WHERE id = 1",
+        (data.get("quota_remaining"), time.time() + backoff)
+    )
+    if backoff:
+        log_message(f"{datetime.now()} - API requested a {backoff}s backoff.")
+
+
+def shard_path(fromdate, todate):
+    return os.path.join(OUTPUT_DIR, f"questions_{fromdate}_{todate}.jsonl.gz")
+
+
+def crawl_window(window):
+    """Fetch every question in one window into its shard.
+
+    Returns "done", "continued" (the window still had results after MAX_PAGES;
+    what was fetched is kept and the rest of the window is queued as a new
+    window) or "stopped" (quota exhausted or the API failed; the window stays
+    pending and is retried on the next run).
+    """
+    fromdate, todate = window
+    state = connect_state()
+    part_path = shard_path(fromdate, todate) + ".part"
+    items = 0
+    # Questions sharing the latest creation_date seen are held back: when the
+    # window is cut there, the remainder starts at that second and refetches them
+    tail, tail_date = [], None
+
+    try:
+        with gzip.open(part_path, "wt", encoding="utf-8") as shard:
+            for page in range(1, MAX_PAGES + 1):
+                wait = acquire_request(state)
+                if wait is None:
+                    log_message(f"{datetime.now()} - Window {fromdate}-{todate}: daily quota exhausted.")
+                    return "stopped"
+                time.sleep(wait)
+
+                url = (f"{BASE_URL}?order=asc&sort=creation&site={SITE}&fromdate={fromdate}&todate={todate}"
+                       f"&pagesize={PAGE_SIZE}&page={page}&key={API_KEY}")
+                try:
+                    response = requests.get(url, timeout=REQUEST_TIMEOUT)
+                    data = response.json()
+                except (requests.RequestException, ValueError) as e:
+                    log_message(f"{datetime.now()} - Window {fromdate}-{todate} page {page}: Exception occurred - {str(e)}")
+                    return "stopped"
+
+                record_response(state, data)
+                if response.status_code != 200:
+                    log_message(f"{datetime.now()} - Window {fromdate}-{todate} page {page}: Failed - Status: {response.status_code}")
+                    log_message(json.dumps(data, indent=2))
+                    return "stopped"
+
+                # Stream the page into the compressed shard, oldest first
+                for item in data["items"]:
+                    if item["creation_date"] != tail_date:
+                        for held in tail:
+                            shard.write(json.dumps(held) + "\n")
+                        items += len(tail)
+                        tail, tail_date = [], item["creation_date"]
+                    tail.append(item)
+
+                if not data.get("has_more"):
+                    break
+            else:
+                # Still more results after MAX_PAGES: keep the shard up to the
+                # last full second and queue the rest of the window
+                if items and fromdate < tail_date <= todate:
+                    os.replace(part_path, shard_path(fromdate, tail_date - 1))
+                    state.execute("BEGIN IMMEDIATE")
+                    state.execute("UPDATE windows SET todate = ?, status = 'done', items = ? WHERE fromdate = ? AND todate = ?",
+                                  (tail_date - 1, items, fromdate, todate))
+                    state.execute("INSERT OR IGNORE INTO windows (fromdate, todate) VALUES (?, ?)", (tail_date, todate))
+                    state.execute("COMMIT")
+                    log_message(f"{datetime.now()} - Window {fromdate}-{tail_date - 1}: Success - {items} questions; "
+                                f"{tail_date}-{todate} queued.")
+                    return "continued"
+                log_message(f"{datetime.now()} - Window {fromdate}-{todate}: truncated at {MAX_PAGES} pages.")
+
+            for held in tail:
+                shard.write(json.dumps(held) + "\n")
+            items += len(tail)
+
+        os.replace(part_path, shard_path(fromdate, todate))
+        state.execute("UPDATE windows SET status = 'done', items = ? WHERE fromdate = ? AND todate = ?",
+                      (items, fromdate, todate))
+        log_message(f"{datetime.now()} - Window {fromdate}-{todate}: Success - {items} questions.")
+        return "done"
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        state.close()
+
+
+def crawl(end_date=None):
+    """Crawl all pending windows with a pool of workers until done or out of quota."""
+    init_state(end_date or datetime.now(timezone.utc))
+    state = connect_state()
+    with Pool(WORKERS) as pool:
+        while True:
+            pending = state.execute(
+                "SELECT fromdate, todate FROM windows WHERE status = 'pending' ORDER BY fromdate"
+            ).fetchall()
+            if not pending:
+                log_message(f"{datetime.now()} - All windows crawled.")
+                break
+
+            log_message(f"{datetime.now()} - Crawling {len(pending)} windows with {WORKERS} workers.")
+            results = pool.map(crawl_window, pending, chunksize=1)
+            if "stopped" in results:
+                log_message(f"{datetime.now()} - Crawl stopped; rerun to resume the pending windows.")
+                break
+    state.close()
+
+
+if __name__ == "__main__":
+    # Optional end date (YYYY-MM-DD) for the crawl; defaults to now
+    end = datetime.strptime(sys.argv[1], "%Y-%m-%d").replace(tzinfo=timezone.utc) if len(sys.argv) > 1 else None
+    crawl(end)
@@ -0,0 +1,45 @@
+# data_fetcher_growth.py
+
+import pandas as pd
+import logging
+import db_backend
+import tag_history
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+MIN_COUNT = 1000  # Tags smaller than this at the start are not ranked
+
+
+def get_snapshot_dates():
+    """Dates of the stored tag count snapshots, oldest first."""
+    return tag_history.list_snapshots()
+
+
+def fetch_risers_and_fallers(start_date, end_date, top_n=10, by="growth_rate"):
+    """Fetch the tags that grew fastest and slowest between two snapshots.
+
+    Computed from the stored snapshots alone (see tag_history.py). Returns
+    (risers, fallers), each with a tag_name column from the shared tag dictionary.
+    """
+    try:
+        risers, fallers = tag_history.risers_and_fallers(start_date, end_date, top_n, by, MIN_COUNT)
+        risers["tag_name"] = db_backend.tag_names(risers["tag_id"])
+        fallers["tag_name"] = db_backend.tag_names(fallers["tag_id"])
+        logger.info(f"Risers and fallers between {start_date} and {end_date} fetched successfully.")
+        return risers, fallers
+    except Exception as e:
+        logger.error(f"Error fetching risers and fallers between {start_date} and {end_date}: {e}")
+        return pd.DataFrame(), pd.DataFrame()
+
+
+def fetch_count_history(tag_ids):
+    """Fetch the count of each given tag in every snapshot, with tag names."""
+    try:
+        history = tag_history.count_history(tag_ids)
+        history["tag_name"] = db_backend.tag_names(history["tag_id"])
+        return history
+    except Exception as e:
+        logger.error(f"Error fetching count history: {e}")
+        return pd.DataFrame()
@@ -0,0 +1,82 @@
+# data_fetcher_network.py
+
+import os
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+from build_network_layouts import LAYOUT_DIR
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Level-of-detail budgets: how much of the graph is sent to the browser at once
+OVERVIEW_MAX_EDGES = 5000
+OVERVIEW_MAX_NODES = 20000
+ZOOMED_MAX_EDGES = 20000
+
+
+def get_all_sites():
+    """List the sites with a precomputed layout (see build_network_layouts.py)."""
+    if not os.path.isdir(LAYOUT_DIR):
+        return []
+    return sorted(name[:-4] for name in os.listdir(LAYOUT_DIR) if name.endswith(".npz"))
+
+
+@lru_cache(maxsize=32)
+def load_layout(site):
+    """Load a site's cached layout arrays."""
+    with np.load(os.path.join(LAYOUT_DIR, f"{site}.npz")) as stored:
+        layout = {name: stored[name] for name in stored.files}
+    logger.info(f"Layout for '{site}' loaded: {len(layout['nodes'])} tags, {len(layout['edges'])} edges.")
+    return layout
+
+
+def fetch_network_view(site, x_range=None, y_range=None):
+    """Return the nodes and edges of a site's network visible in the given viewport.
+
+    Without a viewport the whole graph is shown at overview detail: the
+    heaviest OVERVIEW_MAX_EDGES edges and OVERVIEW_MAX_NODES tags. When zoomed
+    in, everything inside the viewport is shown, up to ZOOMED_MAX_EDGES edges
+    (heaviest first).
+    """
+    try:
+        layout = load_layout(site)
+    except Exception as e:
+        logger.error(f"Error loading layout for '{site}': {e}")
+        return None
+
+    positions, edges = layout["positions"], layout["edges"]
+    node_weight = layout["node_weight"]
+
+    if x_range is None or y_range is None:
+        node_mask = np.zeros(len(positions), dtype=bool)
+        node_mask[np.argsort(node_weight, kind="stable")[::-1][:OVERVIEW_MAX_NODES]] = True
+        edge_ids = np.arange(min(len(edges), OVERVIEW_MAX_EDGES))
+    else:
+        node_mask = ((positions[:, 0] >= x_range[0]) & (positions[:, 0] <= x_range[1]) &
+                     (positions[:, 1] >= y_range[0]) & (positions[:, 1] <= y_range[1]))
+        # Edges are stored heaviest first, so the first matches are the strongest
+        edge_ids = np.flatnonzero(node_mask[edges[:, 0]] | node_mask[edges[:, 1]])[:ZOOMED_MAX_EDGES]
+
+    # Draw all edges as one WebGL line trace, broken up by NaN gaps
+    segments = edges[edge_ids]
+    edge_x = np.full(3 * len(segments), np.nan, dtype=np.float32)
+    edge_y = np.full(3 * len(segments), np.nan, dtype=np.float32)
+    edge_x[0::3], edge_x[1::3] = positions[segments[:, 0], 0], positions[segments[:, 1], 0]
+    edge_y[0::3], edge_y[1::3] = positions[segments[:, 0], 1], positions[segments[:, 1], 1]
+
+    node_ids = np.flatnonzero(node_mask)
+    return {
+        "node_x": positions[node_ids, 0],
+        "node_y": positions[node_ids, 1],
+        "node_tag": layout["nodes"][node_ids],
+        "node_weight": node_weight[node_ids],
+        "edge_x": edge_x,
+        "edge_y": edge_y,
+        "shown_edges": len(segments),
+        "backbone_edges": len(edges),
+        "total_edges": int(layout["total_edges"])
+    }
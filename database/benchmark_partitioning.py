@@ -0,0 +1,196 @@
+# benchmark_partitioning.py
+#
+# Compares the original heap layout of topvotedquestions with the partitioned,
+# BRIN-indexed layout from partition_topvotedquestions.sql on synthetic data.
+# For each scale it builds both layouts in scratch schemas, runs the trend and
+# tag-statistics queries, and writes their plans and latencies to
+# partitioning_benchmark.md. Scratch schemas are dropped afterwards.
+#
+#   python database/benchmark_partitioning.py 1000000 10000000
+
+import os
+import sys
+import time
+import statistics
+from datetime import datetime
+
+import psycopg2
+
+# Database connection parameters
+DB_NAME = "550_1"
+DB_USER = "postgres"
+DB_PASSWORD = "postgres"
+DB_HOST = "localhost"
+DB_PORT = "5432"
+
+DEFAULT_SCALES = [1_000_000, 10_000_000]
+NUM_TAGS = 10000
+TAGS_PER_QUESTION = 3
+REPEATS = 5
+
+MIGRATION_FILE = os.path.join(os.path.dirname(__file__), "partition_topvotedquestions.sql")
+REPORT_FILE = os.path.join(os.path.dirname(__file__), "partitioning_benchmark.md")
+
+# The original schema, as restored from database_backup
+HEAP_SCHEMA = """
+CREATE TABLE tags (
+    tag_id integer PRIMARY KEY,
+    name varchar(255) NOT NULL UNIQUE,
+    count integer
+);
+CREATE TABLE topvotedquestions (
+    question_id integer PRIMARY KEY,
+    view_count integer,
+    is_answered boolean,
+    answer_count integer,
+    score integer,
+    creation_date timestamp without time zone,
+    link text,
+    title text
+);
+CREATE TABLE questiontags (
+    question_id integer NOT NULL REFERENCES topvotedquestions (question_id),
+    tag_id integer NOT NULL REFERENCES tags (tag_id),
+    PRIMARY KEY (question_id, tag_id)
+);
+"""
+
+HEAP_INDEXES = """
+CREATE INDEX idx_questiontags_question_id ON questiontags USING btree (question_id);
+CREATE INDEX idx_questiontags_question_tag ON questiontags USING btree (question_id, tag_id);
+CREATE INDEX idx_questiontags_tag_id ON questiontags USING btree (tag_id);
+CREATE INDEX idx_topvotedquestions_creation_date ON topvotedquestions USING btree (creation_date);
+CREATE INDEX idx_topvotedquestions_score ON topvotedquestions USING btree (score);
+CREATE INDEX idx_topvotedquestions_view_count ON topvotedquestions USING btree (view_count);
+"""
+
+# Questions spread evenly from August 2008 to now; scores and tags are skewed
+# so a few tags are very popular, as on the real site
+SYNTHETIC_DATA = """
+INSERT INTO tags
+SELECT i, 'tag-' || i, 0 FROM generate_series(1, {num_tags}) AS i;
+
+INSERT INTO topvotedquestions
+SELECT i,
+       (random() * 100000)::integer,
+       random() < 0.8,
+       (random() * 10)::integer,
+       (10000 * power(random(), 8))::integer,
+       timestamp '2008-08-01' + (i::double precision / {rows}) * (now()::timestamp - timestamp '2008-08-01'),
+       'https://stackoverflow.com/q/' || i,
+       'Synthetic question ' || i
+FROM generate_series(1, {rows}) AS i;
+
+INSERT INTO questiontags
+SELECT q, 1 + floor({num_tags} * power(random(), 3))::integer
+FROM generate_series(1, {rows}) AS q, generate_series(1, {tags_per_question})
+ON CONFLICT DO NOTHING;
+"""
+
+# Mirrors data_fetcher_trend.fetch_trend_data for the 50 most popular tags over one year
+TREND_QUERY = """
+SELECT tags.name AS tag, topvotedquestions.creation_date, COUNT(topvotedquestions.question_id) AS question_count
+FROM topvotedquestions
+JOIN questiontags ON topvotedquestions.question_id = questiontags.question_id
+JOIN tags ON questiontags.tag_id = tags.tag_id
+WHERE tags.name IN ({tags})
+  AND topvotedquestions.creation_date BETWEEN '2021-01-01' AND '2021-12-31'
+GROUP BY tags.name, topvotedquestions.creation_date
+ORDER BY topvotedquestions.creation_date;
+""".format(tags=", ".join(f"'tag-{i}'" for i in range(1, 51)))
+
+# Mirrors data_fetcher_tree.fetch_tag_statistics, with and without a date range
+STATISTICS_QUERY = """
+SELECT topvotedquestions.score, topvotedquestions.answer_count
+FROM topvotedquestions
+JOIN questiontags ON topvotedquestions.question_id = questiontags.question_id
+JOIN tags ON questiontags.tag_id = tags.tag_id
+WHERE tags.name = 'tag-100'
+{date_filter}
+"""
+
+QUERIES = {
+    "fetch_trend_data (50 tags, 1 year)": TREND_QUERY,
+    "fetch_tag_statistics (1 tag, all years)": STATISTICS_QUERY.format(date_filter=""),
+    "fetch_tag_statistics (1 tag, 1 year)": STATISTICS_QUERY.format(
+        date_filter="AND topvotedquestions.creation_date BETWEEN '2021-01-01' AND '2021-12-31'"
+    ),
+}
+
+
+def log_and_print(message):
+    """Print progress messages with timestamps."""
+    print(f"{datetime.now()} - {message}")
+
+
+def build_layout(cursor, schema, rows, partitioned):
+    """Create a scratch schema holding synthetic data in the heap or partitioned layout."""
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+    cursor.execute(f"SET search_path TO {schema}")
+    cursor.execute(HEAP_SCHEMA)
+    cursor.execute(SYNTHETIC_DATA.format(num_tags=NUM_TAGS, rows=rows, tags_per_question=TAGS_PER_QUESTION))
+    cursor.execute(HEAP_INDEXES)
+    if partitioned:
+        with open(MIGRATION_FILE, "r") as file:
+            cursor.execute(file.read())
+    cursor.execute("VACUUM ANALYZE")
+
+
+def measure(cursor, query):
+    """Return the EXPLAIN ANALYZE plan and the median latency (ms) of query."""
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + query)
+    plan = "\n".join(row[0] for row in cursor.fetchall())
+
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        cursor.execute(query)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return plan, statistics.median(timings)
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SCALES
+    connection = psycopg2.connect(dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT)
+    connection.autocommit = True  # The migration script manages its own transaction
+    cursor = connection.cursor()
+
+    report = [
+        "# Partitioning Benchmark",
+        "",
+        f"Generated by `database/benchmark_partitioning.py` on {datetime.now():%Y-%m-%d %H:%M}.",
+        f"Synthetic data: {NUM_TAGS} tags, up to {TAGS_PER_QUESTION} tags per question. "
+        f"Latency is the median of {REPEATS} warm runs.",
+        "",
+    ]
+    try:
+        for rows in scales:
+            results = {}
+            for layout, partitioned in (("heap", False), ("partitioned", True)):
+                schema = f"bench_{layout}_{rows}"
+                log_and_print(f"Building {layout} layout with {rows:,} questions.")
+                build_layout(cursor, schema, rows, partitioned)
+                for name, query in QUERIES.items():
+                    log_and_print(f"Measuring {name} on {layout} layout.")
+                    results[(layout, name)] = measure(cursor, query)
+                cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+
+            report += [f"## {rows:,} questions", "", "| Query | Heap (ms) | Partitioned (ms) |", "|---|---|---|"]
+            for name in QUERIES:
+                report.append(f"| {name} | {results[('heap', name)][1]:.1f} | {results[('partitioned', name)][1]:.1f} |")
+            report.append("")
+            for (layout, name), (plan, _) in results.items():
+                report += [f"### {name}, {layout}", "", "```", plan, "```", ""]
+    finally:
+        cursor.close()
+        connection.close()
+
+    with open(REPORT_FILE, "w") as file:
+        file.write("\n".join(report))
+    log_and_print(f"Report written to {REPORT_FILE}.")
+
+
+if __name__ == "__main__":
+    main()
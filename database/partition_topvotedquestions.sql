@@ -0,0 +1,78 @@
+-- partition_topvotedquestions.sql
+--
+-- Migrates topvotedquestions from a single heap table to one range-partitioned
+-- by creation_date (one partition per year), so the full question history can
+-- be loaded and date-filtered queries only touch the years they ask for.
+--
+--   psql -U postgres -d 550_1 -f database/partition_topvotedquestions.sql
+--
+-- Notes:
+--   * A partitioned table can only enforce uniqueness on keys that include the
+--     partition key, so the primary key becomes (question_id, creation_date)
+--     and the questiontags -> topvotedquestions foreign key is dropped. The
+--     loader writes a question and its tags in the same transaction.
+--   * creation_date becomes NOT NULL; rows without one are not migrated.
+--   * creation_date is indexed with BRIN instead of btree. Questions arrive in
+--     roughly chronological order, so each block range covers a narrow time
+--     span and the index stays a few pages in size even at tens of millions
+--     of rows.
+
+BEGIN;
+
+ALTER TABLE questiontags DROP CONSTRAINT IF EXISTS questiontags_question_id_fkey;
+
+ALTER TABLE topvotedquestions RENAME TO topvotedquestions_heap;
+ALTER INDEX topvotedquestions_pkey RENAME TO topvotedquestions_heap_pkey;
+
+CREATE TABLE topvotedquestions (
+    question_id integer NOT NULL,
+    view_count integer,
+    is_answered boolean,
+    answer_count integer,
+    score integer,
+    creation_date timestamp without time zone NOT NULL,
+    link text,
+    title text,
+    PRIMARY KEY (question_id, creation_date)
+) PARTITION BY RANGE (creation_date);
+
+-- Creates the partition holding one calendar year; used here and by the loader
+CREATE OR REPLACE FUNCTION create_topvotedquestions_partition(year integer) RETURNS void AS $$
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF topvotedquestions FOR VALUES FROM (%L) TO (%L)',
+        'topvotedquestions_' || year,
+        make_date(year, 1, 1),
+        make_date(year + 1, 1, 1)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Stack Overflow went public in 2008
+SELECT create_topvotedquestions_partition(year)
+FROM generate_series(2008, EXTRACT(YEAR FROM now())::integer) AS year;
+
+INSERT INTO topvotedquestions
+SELECT question_id, view_count, is_answered, answer_count, score, creation_date, link, title
+FROM topvotedquestions_heap
+WHERE creation_date IS NOT NULL
+ORDER BY creation_date;
+
+DROP TABLE topvotedquestions_heap;
+
+-- Indexes are created on the parent and cascade to every partition
+CREATE INDEX idx_topvotedquestions_creation_date ON topvotedquestions USING brin (creation_date) WITH (pages_per_range = 32);
+CREATE INDEX idx_topvotedquestions_score ON topvotedquestions USING btree (score);
+CREATE INDEX idx_topvotedquestions_view_count ON topvotedquestions USING btree (view_count);
+
+-- Covering index for tag -> question lookups: answers "which questions carry
+-- tag X" with an index-only scan. It supersedes the single-column tag index,
+-- and idx_questiontags_question_tag duplicates the primary key.
+CREATE INDEX IF NOT EXISTS idx_questiontags_tag_question ON questiontags USING btree (tag_id, question_id);
+DROP INDEX IF EXISTS idx_questiontags_tag_id;
+DROP INDEX IF EXISTS idx_questiontags_question_tag;
+
+COMMIT;
+
+ANALYZE topvotedquestions;
+ANALYZE questiontags;
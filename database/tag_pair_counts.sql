@@ -0,0 +1,28 @@
+-- tag_pair_counts.sql
+--
+-- Co-tagging counts: for every pair of tags (t1 < t2), the number of
+-- questions tagged with both. insert_top_voted_question.py keeps the table
+-- up to date by upserting the pair deltas of each newly inserted question,
+-- so it never has to be recomputed from questiontags after a load.
+--
+--   psql -U postgres -d 550_1 -f database/tag_pair_counts.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS tag_pair_counts (
+    t1 integer NOT NULL REFERENCES tags (tag_id),
+    t2 integer NOT NULL REFERENCES tags (tag_id),
+    ct integer NOT NULL,
+    PRIMARY KEY (t1, t2),
+    CHECK (t1 < t2)
+);
+
+-- One-off backfill from the questions already loaded
+INSERT INTO tag_pair_counts (t1, t2, ct)
+SELECT a.tag_id, b.tag_id, COUNT(*)
+FROM questiontags a
+JOIN questiontags b ON a.question_id = b.question_id AND a.tag_id < b.tag_id
+GROUP BY a.tag_id, b.tag_id
+ON CONFLICT (t1, t2) DO UPDATE SET ct = EXCLUDED.ct;
+
+COMMIT;
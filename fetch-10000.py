@@ -8,10 +8,12 @@ from datetime import datetime
 PAGE_SIZE = 100
 TOTAL_TAGS = 10000
 MAX_PAGES = TOTAL_TAGS // PAGE_SIZE
-BASE_URL = "https://api.stackexchange.com/2.3/tags"
+API_ROOT = os.environ.get("SE_API_ROOT", "https://api.stackexchange.com/2.3")  # Override to use mock-api.py
+BASE_URL = f"{API_ROOT}/tags"
 LOG_FILE = "log.txt"
 LAST_PAGE_FILE = "last_page.txt"
 API_KEY = "rl_c1moaS69vnAxFksfyEy5h8y19"
+REQUEST_DELAY = float(os.environ.get("SE_API_REQUEST_DELAY", 5))  # Seconds between requests
 
 # Function to log messages
 def log_message(message):
@@ -61,8 +63,8 @@ def fetch_tags():
             log_message(f"Page {page}: Exception occurred - {str(e)}")
             break  # Stop on exception
 
-        # Wait for 5 seconds between requests
-        time.sleep(5)
+        # Wait between requests
+        time.sleep(REQUEST_DELAY)
 
 # Run the fetch_tags function
 fetch_tags()
@@ -1,16 +1,19 @@
 import requests
 import json
 import time
+import os
 from traceback import print_exc, format_exc
 from datetime import datetime
 
 # Constants
-BASE_URL = "https://api.stackexchange.com/2.3/questions"
+API_ROOT = os.environ.get("SE_API_ROOT", "https://api.stackexchange.com/2.3")  # Override to use mock-api.py
+BASE_URL = f"{API_ROOT}/questions"
 SITE = "stackoverflow"
 PAGE_SIZE = 100
 MAX_PAGES = 100  # To get up to 10,000 questions (100 questions * 100 pages)
 API_KEY = "rl_c1moaS69vnAxFksfyEy5h8y19"  # Optional, to avoid rate limits
 LOG_FILE = "log.txt"
+REQUEST_DELAY = float(os.environ.get("SE_API_REQUEST_DELAY", 5))  # Seconds between requests
 
 # Logging function
 def log_message(message):
@@ -54,8 +57,8 @@ def fetch_top_voted_questions():
             log_message(format_exc())
             break  # Stop on exception
 
-        # Wait 5 seconds between requests
-        time.sleep(5)
+        # Wait between requests
+        time.sleep(REQUEST_DELAY)
 
 # Run the function to start fetching
 fetch_top_voted_questions()
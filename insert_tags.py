@@ -3,6 +3,7 @@ import json
 import psycopg2
 from psycopg2 import sql
 from datetime import datetime
+import tag_history
 
 # Database configuration
 DB_NAME = "550_1"
@@ -60,7 +61,7 @@ def insert_data():
                     cursor.execute("""
                         INSERT INTO tags (name, count)
                         VALUES (%s, %s)
-                        ON CONFLICT (name) DO NOTHING;
+                        ON CONFLICT (name) DO UPDATE SET count = EXCLUDED.count;
                     """, (item["name"], item["count"]))
                     
                     # Insert collectives if available
@@ -95,11 +96,24 @@ def insert_data():
             except Exception as e:
                 conn.rollback()  # Rollback in case of error
                 log_message(f"Error processing {filename}: {e}")
-                break  # Stop processing on error
+                return False  # Stop processing on error
+
+    # The run is complete, so the next refresh starts from the first file again
+    if os.path.exists(LAST_PROCESSED_FILE):
+        os.remove(LAST_PROCESSED_FILE)
+    return True
+
+# Append the refreshed counts to the tag count history
+def snapshot_tag_counts():
+    cursor.execute("SELECT tag_id, count FROM tags WHERE count IS NOT NULL;")
+    rows = cursor.fetchall()
+    tag_history.append_snapshot([row[0] for row in rows], [row[1] for row in rows])
+    log_message(f"Appended a snapshot of {len(rows)} tag counts to {tag_history.HISTORY_DIR}")
 
 # Run the insertion process
 try:
-    insert_data()
+    if insert_data():
+        snapshot_tag_counts()
 finally:
     cursor.close()
     conn.close()
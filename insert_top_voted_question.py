@@ -1,9 +1,12 @@
 import os
 import json
 import psycopg2
+from psycopg2.extras import execute_values
 import logging
 from datetime import datetime
 import sys
+from collections import Counter, defaultdict
+from itertools import combinations, product
 
 # Database connection parameters
 DB_NAME = "550_1"
@@ -38,16 +41,86 @@ except Exception as e:
     log_and_print(f"Failed to connect to the database: {e}")
     exit()
 
+# Whether partition_topvotedquestions.sql has been applied; the loader works with either layout
+cursor.execute("""
+    SELECT EXISTS (
+        SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'topvotedquestions'::regclass
+    )
+""")
+PARTITIONED = cursor.fetchone()[0]
+# The partitioned table's primary key must include the partition key
+QUESTION_CONFLICT_TARGET = "(question_id, creation_date)" if PARTITIONED else "(question_id)"
+log_and_print(f"topvotedquestions is {'partitioned' if PARTITIONED else 'a plain table'}.")
+
+# tag_pair_counts is optional (database/tag_pair_counts.sql); without it the loader skips the counts
+cursor.execute("SELECT to_regclass('tag_pair_counts') IS NOT NULL")
+TAG_PAIR_COUNTS = cursor.fetchone()[0]
+if not TAG_PAIR_COUNTS:
+    log_and_print("tag_pair_counts not found; co-tagging counts will not be updated.")
+
+# Partitions already known to exist in this run
+created_partitions = set()
+
+def ensure_partitions(items):
+    """Create the yearly topvotedquestions partitions a batch of questions will land in."""
+    cursor.execute("""
+        SELECT DISTINCT EXTRACT(YEAR FROM TO_TIMESTAMP(ts)::timestamp)::integer
+        FROM unnest(%s::bigint[]) AS ts
+    """, ([item["creation_date"] for item in items],))
+    for (year,) in cursor.fetchall():
+        if year not in created_partitions:
+            cursor.execute("SELECT create_topvotedquestions_partition(%s)", (year,))
+            created_partitions.add(year)
+
+def update_tag_pair_counts(inserted_question_tags):
+    """Add the tag pairs created by newly inserted QuestionTags rows to tag_pair_counts.
+
+    inserted_question_tags holds the (question_id, tag_id) rows inserted in the
+    current transaction. Each new tag pairs with the question's other new tags
+    and with the tags it already had, so a rerun that adds tags to an existing
+    question is counted too. The pair deltas are aggregated first because a
+    single upsert statement cannot touch the same pair twice.
+    """
+    new_tags = defaultdict(set)
+    for question_id, tag_id in inserted_question_tags:
+        new_tags[question_id].add(tag_id)
+    if not new_tags:
+        return
+
+    # Tags the questions had before this transaction
+    cursor.execute("SELECT question_id, tag_id FROM questiontags WHERE question_id = ANY(%s)", (list(new_tags),))
+    old_tags = defaultdict(set)
+    for question_id, tag_id in cursor.fetchall():
+        if tag_id not in new_tags[question_id]:
+            old_tags[question_id].add(tag_id)
+
+    deltas = Counter()
+    for question_id, tag_ids in new_tags.items():
+        deltas.update(combinations(sorted(tag_ids), 2))
+        deltas.update(tuple(sorted(pair)) for pair in product(tag_ids, old_tags[question_id]))
+    if not deltas:
+        return
+
+    # Sorted so concurrent loaders lock pairs in the same order
+    execute_values(cursor, """
+        INSERT INTO tag_pair_counts (t1, t2, ct)
+        VALUES %s
+        ON CONFLICT (t1, t2) DO UPDATE SET ct = tag_pair_counts.ct + EXCLUDED.ct
+    """, [(t1, t2, ct) for (t1, t2), ct in sorted(deltas.items())], page_size=1000)
+
 # Insert data function
-def insert_data(data):
-    """Insert question data into the TopVotedQuestions and QuestionTags tables."""
+def insert_data(items):
+    """Insert one file's questions into TopVotedQuestions, QuestionTags and tag_pair_counts in a single transaction."""
     try:
-        # Insert into TopVotedQuestions
-        cursor.execute("""
+        if PARTITIONED:
+            ensure_partitions(items)
+
+        # Insert into TopVotedQuestions; on the partitioned layout rows are routed to their creation_date partition
+        execute_values(cursor, f"""
             INSERT INTO TopVotedQuestions (question_id, view_count, is_answered, answer_count, score, creation_date, link, title)
-            VALUES (%s, %s, %s, %s, %s, TO_TIMESTAMP(%s), %s, %s)
-            ON CONFLICT (question_id) DO NOTHING
-        """, (
+            VALUES %s
+            ON CONFLICT {QUESTION_CONFLICT_TARGET} DO NOTHING
+        """, [(
             data["question_id"],
             data["view_count"],
             data["is_answered"],
@@ -56,52 +129,62 @@ def insert_data(data):
             data["creation_date"],
             data["link"],
             data["title"]
-        ))
+        ) for data in items], template="(%s, %s, %s, %s, %s, TO_TIMESTAMP(%s), %s, %s)", page_size=1000)
         
         # Insert into QuestionTags
-        for tag in data["tags"]:
-            cursor.execute("""
-                INSERT INTO QuestionTags (question_id, tag_id)
-                SELECT %s, tag_id FROM tags WHERE name = %s
-                ON CONFLICT (question_id, tag_id) DO NOTHING
-            """, (data["question_id"], tag))
+        question_tags = execute_values(cursor, """
+            INSERT INTO QuestionTags (question_id, tag_id)
+            SELECT v.question_id, tags.tag_id
+            FROM (VALUES %s) AS v(question_id, name)
+            JOIN tags ON tags.name = v.name
+            ON CONFLICT (question_id, tag_id) DO NOTHING
+            RETURNING question_id, tag_id
+        """, [(data["question_id"], tag) for data in items for tag in data["tags"]], page_size=1000, fetch=True)
+
+        # Keep co-tagging counts current in the same transaction, touching only the new rows
+        if TAG_PAIR_COUNTS:
+            update_tag_pair_counts(question_tags)
         
         connection.commit()
     except Exception as e:
         connection.rollback()
-        log_and_print(f"Error inserting data for question ID {data['question_id']}: {e}")
+        log_and_print(f"Error inserting data for question IDs {items[0]['question_id']}..{items[-1]['question_id']}: {e}")
         sys.exit(-255)
 
+def page_files(directory):
+    """List the numbered JSON page files in directory, in page order."""
+    pages = [name for name in os.listdir(directory) if name.endswith(".json") and name[:-5].isdigit()]
+    return sorted(pages, key=lambda name: int(name[:-5]))
+
 # Process files
-for filename in range(1, 101):  # Files numbered from 1 to 100
-    filepath = os.path.join(DATA_DIR, f"{filename}.json")
-    if not os.path.isfile(filepath):
-        log_and_print(f"File {filename}.json not found.")
-        continue
-    
-    log_and_print(f"Processing file: {filename}.json")
+for filename in page_files(DATA_DIR):
+    filepath = os.path.join(DATA_DIR, filename)
+    log_and_print(f"Processing file: {filename}")
     
     # Load and insert data from JSON file
     try:
         with open(filepath, "r") as file:
             content = json.load(file)
-            for item in content["items"]:
-                # Clean data and insert
-                item_data = {
-                    "question_id": item["question_id"],
-                    "view_count": item["view_count"],
-                    "is_answered": item["is_answered"],
-                    "answer_count": item["answer_count"],
-                    "score": item["score"],
-                    "creation_date": item["creation_date"],
-                    "link": item["link"],
-                    "title": item["title"],
-                    "tags": item["tags"]
-                }
-                insert_data(item_data)
-                log_and_print(f"Inserted question ID {item_data['question_id']} successfully.")
+        items = [
+            # Clean data
+            {
+                "question_id": item["question_id"],
+                "view_count": item["view_count"],
+                "is_answered": item["is_answered"],
+                "answer_count": item["answer_count"],
+                "score": item["score"],
+                "creation_date": item["creation_date"],
+                "link": item["link"],
+                "title": item["title"],
+                "tags": item["tags"]
+            }
+            for item in content["items"]
+        ]
+        if items:
+            insert_data(items)
+            log_and_print(f"Inserted {len(items)} questions from {filename} successfully.")
     except Exception as e:
-        log_and_print(f"Error processing file {filename}.json: {e}")
+        log_and_print(f"Error processing file {filename}: {e}")
 
 # Close database connection
 cursor.close()
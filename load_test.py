@@ -0,0 +1,127 @@
+# load_test.py
+#
+# Fires the same dashboard callback from many concurrent "users" and reports
+# throughput and latency. Run it against one of the dashboards, e.g.
+#
+#   python app_trend.py                        # in one shell
+#   python load_test.py trend --users 20       # in another
+#
+# and compare against a baseline started with SOTI_SINGLE_FLIGHT=0 to see the
+# effect of request coalescing.
+
+import argparse
+import statistics
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+UPDATE_COMPONENT_PATH = "/_dash-update-component"
+POLL_INTERVAL = 0.1  # Seconds between polls of a running background callback
+REQUEST_TIMEOUT = 120
+
+# Callback payloads as the Dash renderer would send them
+SCENARIOS = {
+    "tree": {
+        "url": "http://127.0.0.1:8050",
+        "payload": {
+            "output": "collapsible-tree.figure",
+            "outputs": {"id": "collapsible-tree", "property": "figure"},
+            "inputs": [{"id": "collapsible-tree", "property": "id", "value": "collapsible-tree"}],
+            "changedPropIds": [],
+            "state": []
+        }
+    },
+    "trend": {
+        "url": "http://127.0.0.1:8050",
+        "payload": {
+            "output": "..trend-store.data...collective-limit-warning.children..",
+            "outputs": [
+                {"id": "trend-store", "property": "data"},
+                {"id": "collective-limit-warning", "property": "children"}
+            ],
+            "inputs": [
+                {"id": "collective-search", "property": "value", "value": ["Mobile Development", "R Language"]}
+            ],
+            "changedPropIds": ["collective-search.value"],
+            "state": []
+        }
+    }
+}
+
+
+def run_callback(session, url, payload):
+    """Call a Dash callback, following the background-callback polling protocol."""
+    endpoint = url.rstrip("/") + UPDATE_COMPONENT_PATH
+    response = session.post(endpoint, json=payload, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    body = response.json()
+
+    # Background callbacks answer with a job handle that has to be polled
+    if "cacheKey" in body:
+        params = {"cacheKey": body["cacheKey"], "job": body["job"]}
+        while True:
+            time.sleep(POLL_INTERVAL)
+            response = session.post(endpoint, json=payload, params=params, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            if response.status_code == 204:
+                return
+            body = response.json()
+            if "response" in body:
+                return
+
+
+def simulate_user(url, payload, requests_per_user, latencies, errors, lock):
+    """One user issuing the same callback back to back."""
+    session = requests.Session()
+    for _ in range(requests_per_user):
+        started = time.perf_counter()
+        try:
+            run_callback(session, url, payload)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            continue
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a dashboard callback with concurrent users.")
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument("--url", help="Dashboard base URL (defaults to the scenario's)")
+    parser.add_argument("--users", type=int, default=10, help="Number of concurrent users")
+    parser.add_argument("--requests", type=int, default=5, help="Callbacks issued per user")
+    args = parser.parse_args()
+
+    scenario = SCENARIOS[args.scenario]
+    url = args.url or scenario["url"]
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    print(f"{datetime.now()} - {args.users} users x {args.requests} requests against {url} ({args.scenario})")
+    started = time.perf_counter()
+    users = [
+        threading.Thread(target=simulate_user,
+                         args=(url, scenario["payload"], args.requests, latencies, errors, lock))
+        for _ in range(args.users)
+    ]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"Completed: {len(latencies)}  Errors: {len(errors)}  Wall time: {elapsed:.2f}s")
+    if latencies:
+        latencies.sort()
+        print(f"Throughput: {len(latencies) / elapsed:.2f} callbacks/s")
+        print(f"Latency p50: {statistics.median(latencies):.3f}s  "
+              f"p95: {latencies[int(0.95 * (len(latencies) - 1))]:.3f}s  max: {latencies[-1]:.3f}s")
+    for error in errors[:5]:
+        print(f"Error: {error}")
+
+
+if __name__ == "__main__":
+    main()
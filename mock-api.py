@@ -1,12 +1,244 @@
-from flask import Flask, jsonify
+# mock-api.py
+#
+# Async mock of the Stack Exchange API for offline development and load testing.
+# It generates any number of tag and question pages deterministically from a
+# seed. It honours page/pagesize/fromdate/todate, reports has_more,
+# quota_remaining and backoff like the real API, and can inject latency and
+# errors.
+#
+#   python mock-api.py --latency 150 --error-rate 0.01 --backoff-rate 0.02
+#
+# Point the fetchers at it with
+#
+#   SE_API_ROOT=http://127.0.0.1:5000/2.3 SE_API_REQUEST_DELAY=0 python fetch_top_voted.py
+#   SE_API_ROOT=http://127.0.0.1:5000/2.3 python crawl_questions.py
 
-app = Flask(__name__)
+import time
+import math
+import random
+import asyncio
+import argparse
+from datetime import datetime, timezone
 
-@app.route('/api/tags', methods=['GET'])
-def get_tags():
-    return jsonify(
-        {"items":[{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":2536177,"name":"javascript"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":2213915,"name":"python"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":1921384,"name":"java"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":1624095,"name":"c#"},{"collectives":[{"tags":["php"],"external_links":[{"type":"support","link":"https://stackoverflow.com/contact?topic=15"}],"description":"A collective where developers working with PHP can learn and connect about the open source scripting language.","link":"/collectives/php","name":"PHP","slug":"php"}],"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":1468947,"name":"php"},{"collectives":[{"tags":["android","ios"],"external_links":[{"type":"support","link":"https://stackoverflow.com/contact?topic=15"}],"description":"A collective for developers who want to share their knowledge and learn more about mobile development practices and platforms","link":"/collectives/mobile-dev","name":"Mobile Development","slug":"mobile-dev"}],"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":1421106,"name":"android"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":1190513,"name":"html"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":1034104,"name":"jquery"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":812961,"name":"c++"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":807935,"name":"css"},{"collectives":[{"tags":["android","ios"],"external_links":[{"type":"support","link":"https://stackoverflow.com/contact?topic=15"}],"description":"A collective for developers who want to share their knowledge and learn more about mobile development practices and platforms","link":"/collectives/mobile-dev","name":"Mobile Development","slug":"mobile-dev"}],"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":688997,"name":"ios"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":674599,"name":"sql"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":662175,"name":"mysql"},{"collectives":[{"tags":["shiny","purrr","tibble","plyr","rlang","shinyapps","tidyr","r-package","r","tidyverse","rvest","shinydashboard","rstudio","ggplot2","stringr","quantmod","dplyr","r-raster","readr","lubridate","data.table","knitr","zoo","forcats","dtplyr","r-caret","shiny-server"],"external_links":[{"type":"support","link":"https://stackoverflow.com/contact?topic=15"}],"description":"A collective where data scientists and AI researchers gather to find, share, and learn about R and other subtags like knitr and dplyr.","link":"/collectives/r-language","name":"R Language","slug":"r-language"}],"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":510171,"name":"r"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":481564,"name":"reactjs"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":474554,"name":"node.js"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":418006,"name":"arrays"},{"has_synonyms":False,"is_moderator_only":False,"is_required":False,"count":407113,"name":"c"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":374879,"name":"asp.net"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":361572,"name":"json"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":343744,"name":"python-3.x"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":340841,"name":".net"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":338424,"name":"ruby-on-rails"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":336473,"name":"sql-server"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":335961,"name":"swift"},{"has_synonyms":False,"is_moderator_only":False,"is_required":False,"count":313245,"name":"django"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":307097,"name":"angular"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":292224,"name":"objective-c"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":289776,"name":"excel"},{"has_synonyms":True,"is_moderator_only":False,"is_required":False,"count":288978,"name":"pandas"}],"has_more":True,"quota_max":300,"quota_remaining":287}
-    )
+from aiohttp import web
 
-if __name__ == '__main__':
-    app.run(debug=True)
+MAX_PAGE_SIZE = 100
+QUOTA_MAX = 10000
+START_DATE = int(datetime(2008, 7, 31, tzinfo=timezone.utc).timestamp())
+END_DATE = int(datetime(2024, 12, 31, tzinfo=timezone.utc).timestamp())
+TOP_TAG_COUNT = 2536177  # javascript, the most used tag
+TOP_SCORE = 27000  # Roughly the highest-voted question on Stack Overflow
+
+# The most popular tags keep their real names; the long tail is synthetic
+POPULAR_TAGS = [
+    "javascript", "python", "java", "c#", "php", "android", "html", "jquery", "c++", "css",
+    "ios", "sql", "mysql", "r", "reactjs", "node.js", "arrays", "c", "asp.net", "json",
+    "python-3.x", ".net", "ruby-on-rails", "sql-server", "swift", "django", "angular",
+    "objective-c", "excel", "pandas"
+]
+COLLECTIVES = {
+    "php": {"name": "PHP", "slug": "php", "tags": ["php"]},
+    "android": {"name": "Mobile Development", "slug": "mobile-dev", "tags": ["android", "ios"]},
+    "ios": {"name": "Mobile Development", "slug": "mobile-dev", "tags": ["android", "ios"]},
+    "r": {"name": "R Language", "slug": "r-language", "tags": ["r"]},
+}
+
+
+def error(status, error_id, error_name, message):
+    """An error response in the API's wrapper format."""
+    return web.json_response({"error_id": error_id, "error_name": error_name, "error_message": message}, status=status)
+
+
+def int_param(request, name, default):
+    value = request.query.get(name)
+    return default if value is None else int(value)
+
+
+class MockStackExchange:
+    """Deterministic tag and question generator plus per-key quota and backoff bookkeeping."""
+
+    def __init__(self, seed, num_tags, num_questions, latency, error_rate, backoff_rate, max_page):
+        self.seed = seed
+        self.num_tags = num_tags
+        self.num_questions = num_questions
+        self.latency = latency / 1000
+        self.error_rate = error_rate
+        self.backoff_rate = backoff_rate
+        self.max_page = max_page
+        self.step = (END_DATE - START_DATE) / num_questions  # Seconds between consecutive questions
+        self.rng = random.Random(seed)  # Drives injected faults only, never the data
+        self.quota = {}  # key -> (day, remaining)
+        self.backoff_until = {}  # key -> timestamp before which requests are throttled
+
+    # Data generation
+
+    def tag_name(self, rank):
+        return POPULAR_TAGS[rank] if rank < len(POPULAR_TAGS) else f"tag-{rank}"
+
+    def tag(self, rank):
+        """The tag at popularity rank (0 = most used); counts follow a Zipf curve."""
+        name = self.tag_name(rank)
+        rng = random.Random(f"{self.seed}:tag:{rank}")
+        item = {
+            "has_synonyms": rng.random() < 0.3,
+            "is_moderator_only": False,
+            "is_required": False,
+            "count": max(1, int(TOP_TAG_COUNT / (rank + 1) ** 1.1)),
+            "name": name
+        }
+        if name in COLLECTIVES:
+            collective = COLLECTIVES[name]
+            item["collectives"] = [{
+                "tags": collective["tags"],
+                "external_links": [{"type": "support", "link": "https://stackoverflow.com/contact?topic=15"}],
+                "description": f"A collective for developers working with {collective['name']}.",
+                "link": f"/collectives/{collective['slug']}",
+                "name": collective["name"],
+                "slug": collective["slug"]
+            }]
+        return item
+
+    def question(self, index, score):
+        """The question at chronological position index; its tags favour popular ones."""
+        question_id = index + 1
+        rng = random.Random(f"{self.seed}:question:{question_id}")
+        tags = []
+        for _ in range(rng.randint(1, 5)):
+            rank = min(self.num_tags - 1, int(rng.paretovariate(0.8)) - 1)
+            name = self.tag_name(rank)
+            if name not in tags:
+                tags.append(name)
+        creation_date = START_DATE + int(index * self.step)
+        answer_count = rng.randint(0, 12)
+        return {
+            "tags": tags,
+            "is_answered": answer_count > 0 and rng.random() < 0.8,
+            "view_count": int(max(score, 0) * rng.uniform(50, 400)) + rng.randint(0, 500),
+            "answer_count": answer_count,
+            "score": score,
+            "last_activity_date": creation_date + rng.randint(0, END_DATE - creation_date),
+            "creation_date": creation_date,
+            "question_id": question_id,
+            "content_license": "CC BY-SA 4.0",
+            "link": f"https://stackoverflow.com/questions/{question_id}/mock-question-{question_id}",
+            "title": f"Mock question {question_id} about {' and '.join(tags)}"
+        }
+
+    def question_range(self, fromdate, todate):
+        """Chronological index range [lo, hi) of questions created within [fromdate, todate]."""
+        lo = max(0, math.ceil((fromdate - START_DATE) / self.step))
+        hi = min(self.num_questions, math.floor((todate - START_DATE) / self.step) + 1)
+        return lo, max(lo, hi)
+
+    # Request handling
+
+    async def wrap(self, request, pages):
+        """Apply latency, validation, faults, backoff and quota, then build the response wrapper.
+
+        pages(fromdate, todate) returns (total, page_items) for the validated
+        date range. Bad parameters are rejected before the backoff and quota
+        are checked, so they never cost the caller a request.
+        """
+        if self.latency:
+            await asyncio.sleep(self.rng.expovariate(1 / self.latency))
+
+        try:
+            page = int_param(request, "page", 1)
+            pagesize = int_param(request, "pagesize", 30)
+            fromdate = int_param(request, "fromdate", START_DATE)
+            todate = int_param(request, "todate", END_DATE)
+        except ValueError:
+            return error(400, 400, "bad_parameter", "page, pagesize, fromdate and todate must be integers.")
+        if page < 1 or not 1 <= pagesize <= MAX_PAGE_SIZE:
+            return error(400, 400, "bad_parameter", f"page must be at least 1 and pagesize between 1 and {MAX_PAGE_SIZE}.")
+        if page > self.max_page:
+            return error(400, 400, "bad_parameter", f"page above {self.max_page} is not allowed.")
+        total, page_items = pages(fromdate, todate)
+
+        if self.rng.random() < self.error_rate:
+            return error(500, 500, "internal_error", "Injected failure.")
+
+        key = request.query.get("key", request.remote)
+        now = time.time()
+        if now < self.backoff_until.get(key, 0):
+            return error(400, 502, "throttle_violation", "Backoff not respected; wait before retrying.")
+
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        quota_day, remaining = self.quota.get(key, (day, QUOTA_MAX))
+        if quota_day != day:
+            remaining = QUOTA_MAX
+        if remaining <= 0:
+            return error(400, 502, "throttle_violation", "Daily quota exhausted.")
+        self.quota[key] = (day, remaining - 1)
+
+        start = (page - 1) * pagesize
+        body = {
+            "items": page_items(start, min(start + pagesize, total)),
+            "has_more": start + pagesize < total,
+            "quota_max": QUOTA_MAX,
+            "quota_remaining": remaining - 1
+        }
+        if self.rng.random() < self.backoff_rate:
+            backoff = self.rng.randint(1, 10)
+            body["backoff"] = backoff
+            self.backoff_until[key] = now + backoff
+        return web.json_response(body)
+
+    async def tags(self, request):
+        """/tags, sorted by popularity."""
+        return await self.wrap(request, lambda fromdate, todate: (
+            self.num_tags, lambda start, end: [self.tag(rank) for rank in range(start, end)]))
+
+    async def questions(self, request):
+        """/questions, filtered by fromdate/todate and sorted by votes or creation date."""
+        sort = request.query.get("sort", "activity")
+        descending = request.query.get("order", "desc") == "desc"
+        return await self.wrap(request, lambda fromdate, todate: self.question_pages(fromdate, todate, sort, descending))
+
+    def question_pages(self, fromdate, todate, sort, descending):
+        """(total, page_items) of the questions created within [fromdate, todate]."""
+        lo, hi = self.question_range(fromdate, todate)
+        total = hi - lo
+
+        if sort == "votes":
+            # A fixed pseudo-random permutation of the window, with scores falling by rank
+            multiplier = 2654435761
+            while total and math.gcd(multiplier, total) != 1:
+                multiplier += 2
+
+            def page_items(start, end):
+                ranks = range(start, end) if descending else range(total - 1 - start, total - 1 - end, -1)
+                return [self.question(lo + (rank * multiplier) % total, int(TOP_SCORE / (1 + rank) ** 0.7))
+                        for rank in ranks]
+        else:
+            def page_items(start, end):
+                positions = range(hi - 1 - start, hi - 1 - end, -1) if descending else range(lo + start, lo + end)
+                return [self.question(index, random.Random(f"{self.seed}:score:{index}").randint(-5, 50))
+                        for index in positions]
+
+        return total, page_items
+
+
+def create_app(mock):
+    app = web.Application()
+    app.router.add_get("/2.3/tags", mock.tags)
+    app.router.add_get("/2.3/questions", mock.questions)
+    app.router.add_get("/api/tags", mock.tags)  # Path used by earlier versions of this mock
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deterministic async mock of the Stack Exchange API.")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=550)
+    parser.add_argument("--tags", type=int, default=60000, help="Number of tags to generate")
+    parser.add_argument("--questions", type=int, default=24000000, help="Number of questions to generate")
+    parser.add_argument("--latency", type=float, default=0, help="Mean injected latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--backoff-rate", type=float, default=0, help="Fraction of responses carrying a backoff")
+    parser.add_argument("--max-page", type=int, default=100, help="Deepest page served before refusing")
+    args = parser.parse_args()
+
+    mock = MockStackExchange(args.seed, args.tags, args.questions, args.latency,
+                             args.error_rate, args.backoff_rate, args.max_page)
+    web.run_app(create_app(mock), port=args.port)
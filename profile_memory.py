@@ -0,0 +1,153 @@
+# profile_memory.py
+#
+# Measures the memory a Dash worker needs for each fetch path. It writes a
+# synthetic Parquet export (default 1M questions) and runs every fetcher on
+# the DuckDB backend in a fresh process. Each run is done twice: with the
+# compact frames and with SOTI_COMPACT_FRAMES=0 (frames as the backend returns them).
+# It reports the worker's RSS after imports, after the fetch (holding the
+# result) and at its peak. The report is printed and written to
+# benchmarks/memory_profile.md.
+#
+#   python profile_memory.py              # 1M questions
+#   python profile_memory.py 5000000
+
+import os
+import sys
+import shutil
+import tempfile
+import resource
+import multiprocessing
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_QUESTIONS = 1_000_000
+NUM_TAGS = 60000
+NUM_COLLECTIVES = 20
+COLLECTIVE_TAGS = 600  # The most popular tags belong to a collective
+TAGS_PER_QUESTION = 3
+SEED = 550
+
+# Tracked with the code, unlike data/
+REPORT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "memory_profile.md")
+
+# name -> (module, function, args)
+FETCH_PATHS = {
+    "fetch_sunburst_data": ("data_fetcher", "fetch_sunburst_data", ()),
+    "fetch_tree_data": ("data_fetcher_tree", "fetch_tree_data", ()),
+    "fetch_trend_data": ("data_fetcher_trend", "fetch_trend_data", (["Collective 1", "Collective 2"], "2021-01-01", "2023-12-31")),
+    "fetch_tag_statistics": ("data_fetcher_tree", "fetch_tag_statistics", ("tag-100",)),
+}
+
+
+def log_and_print(message):
+    """Print progress messages with timestamps."""
+    print(f"{datetime.now()} - {message}")
+
+
+def write_synthetic_export(export_dir, num_questions):
+    """Write the five tables as Parquet files, shaped like the real data (skewed tag use)."""
+    rng = np.random.default_rng(SEED)
+    tag_ids = np.arange(1, NUM_TAGS + 1, dtype=np.int32)
+    pd.DataFrame({
+        "tag_id": tag_ids,
+        "name": [f"tag-{tag_id}" for tag_id in tag_ids],
+        "count": (2500000 / tag_ids.astype(np.float64) ** 1.1).astype(np.int32)
+    }).to_parquet(os.path.join(export_dir, "tags.parquet"), index=False)
+
+    collective_ids = np.arange(1, NUM_COLLECTIVES + 1, dtype=np.int32)
+    pd.DataFrame({
+        "collective_id": collective_ids,
+        "collective_name": [f"Collective {collective_id}" for collective_id in collective_ids]
+    }).to_parquet(os.path.join(export_dir, "collectives.parquet"), index=False)
+
+    pd.DataFrame({
+        "tag_id": tag_ids[:COLLECTIVE_TAGS],
+        "collective_id": (1 + tag_ids[:COLLECTIVE_TAGS] % NUM_COLLECTIVES).astype(np.int32)
+    }).to_parquet(os.path.join(export_dir, "tag_collectives.parquet"), index=False)
+
+    question_ids = np.arange(1, num_questions + 1, dtype=np.int32)
+    start = np.datetime64("2008-08-01", "s")
+    span = (np.datetime64("2023-12-31", "s") - start).astype(np.int64)
+    pd.DataFrame({
+        "question_id": question_ids,
+        "view_count": rng.integers(0, 100000, num_questions, dtype=np.int32),
+        "is_answered": rng.random(num_questions) < 0.8,
+        "answer_count": rng.integers(0, 10, num_questions, dtype=np.int32),
+        "score": (10000 * rng.random(num_questions) ** 8).astype(np.int32),
+        "creation_date": start + (span * (question_ids / num_questions)).astype(np.int64).astype("timedelta64[s]"),
+        "link": [f"https://stackoverflow.com/q/{question_id}" for question_id in question_ids],
+        "title": [f"Synthetic question {question_id}" for question_id in question_ids]
+    }).to_parquet(os.path.join(export_dir, "topvotedquestions.parquet"), index=False)
+
+    pairs = pd.DataFrame({
+        "question_id": np.repeat(question_ids, TAGS_PER_QUESTION),
+        "tag_id": (1 + np.floor(NUM_TAGS * rng.random(num_questions * TAGS_PER_QUESTION) ** 3)).astype(np.int32)
+    }).drop_duplicates()
+    pairs.to_parquet(os.path.join(export_dir, "questiontags.parquet"), index=False)
+    log_and_print(f"Synthetic export with {num_questions:,} questions and {len(pairs):,} question-tag pairs written.")
+
+
+def rss_mib():
+    import psutil
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def profile_fetch(export_dir, compact, module_name, function_name, args, results):
+    """Run one fetcher in this (fresh) process and record its memory use."""
+    os.environ["SOTI_COMPACT_FRAMES"] = "1" if compact else "0"
+    import importlib
+    import db_backend
+    import single_flight
+    single_flight.SINGLE_FLIGHT_ENABLED = False  # Measure the fetch itself, not a shared result
+    db_backend.configure(backend="duckdb", export_dir=export_dir)
+    fetch = getattr(importlib.import_module(module_name), function_name)
+
+    baseline = rss_mib()
+    result = fetch(*args)
+    held = rss_mib()
+    # ru_maxrss is in KiB on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((baseline, held, peak))
+    del result
+
+
+def main():
+    num_questions = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_QUESTIONS
+    export_dir = tempfile.mkdtemp(prefix="soti_profile_")
+    context = multiprocessing.get_context("spawn")  # Every measurement starts from a fresh interpreter
+    report = [
+        "# Memory Profile",
+        "",
+        f"Generated by `profile_memory.py` on {datetime.now():%Y-%m-%d %H:%M} with {num_questions:,} synthetic "
+        f"questions on the DuckDB backend. RSS of one worker process in MiB.",
+        "",
+        "| Fetch path | Frames | After imports | Holding result | Peak |",
+        "|---|---|---|---|---|"
+    ]
+    try:
+        write_synthetic_export(export_dir, num_questions)
+        for name, (module_name, function_name, args) in FETCH_PATHS.items():
+            for compact in (False, True):
+                label = "compact" if compact else "uncompacted"
+                log_and_print(f"Profiling {name} with {label} frames.")
+                results = context.Queue()
+                worker = context.Process(target=profile_fetch,
+                                         args=(export_dir, compact, module_name, function_name, args, results))
+                worker.start()
+                baseline, held, peak = results.get()
+                worker.join()
+                report.append(f"| {name} | {label} | {baseline:.0f} | {held:.0f} | {peak:.0f} |")
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+    print("\n".join(report))
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, "w") as file:
+        file.write("\n".join(report) + "\n")
+    log_and_print(f"Report written to {REPORT_FILE}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# single_flight.py
+
+import os
+import threading
+import logging
+from functools import wraps
+
+import diskcache
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Shared on-disk cache: backs the Dash background callback manager and the
+# cross-process half of the single-flight layer below.
+CACHE_DIR = os.environ.get("SOTI_CACHE_DIR", "./cache")
+cache = diskcache.Cache(CACHE_DIR)
+
+# Set SOTI_SINGLE_FLIGHT=0 to disable coalescing (e.g. for load-test baselines)
+SINGLE_FLIGHT_ENABLED = os.environ.get("SOTI_SINGLE_FLIGHT", "1") != "0"
+# How long (seconds) a finished result stays visible to callers that queued up
+# behind the leading call in another process
+SINGLE_FLIGHT_TTL = 5
+# Upper bound (seconds) on how long a leader may hold the cross-process lock
+SINGLE_FLIGHT_LOCK_EXPIRE = 120
+
+_MISSING = object()
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+class _Flight:
+    """An in-progress call that concurrent callers with the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _flight_key(func, args, kwargs):
+    """Build a stable key identifying a call by function and arguments."""
+    frozen_args = tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args)
+    frozen_kwargs = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value) for name, value in kwargs.items()
+    ))
+    return f"{func.__module__}.{func.__qualname__}:{frozen_args!r}:{frozen_kwargs!r}"
+
+
+def _call_across_processes(func, key, args, kwargs):
+    """Run func once per key across processes sharing the on-disk cache.
+
+    Background callbacks run in worker processes, so the thread-level flight
+    table alone cannot see them. Callers block on a diskcache lock while the
+    leader queries; on release they pick up the leader's result instead of
+    issuing the same query again.
+    """
+    result_key = f"single-flight:result:{key}"
+    with diskcache.Lock(cache, f"single-flight:lock:{key}", expire=SINGLE_FLIGHT_LOCK_EXPIRE):
+        result = cache.get(result_key, default=_MISSING)
+        if result is not _MISSING:
+            logger.info(f"Single-flight: reused in-flight result for {func.__qualname__}.")
+            return result
+        result = func(*args, **kwargs)
+        cache.set(result_key, result, expire=SINGLE_FLIGHT_TTL)
+        return result
+
+
+def single_flight(func):
+    """Collapse concurrent identical calls of func into a single execution.
+
+    The first caller for a given set of arguments runs the query; callers that
+    arrive while it is still running wait and share its result. Nothing is
+    kept once the call has finished apart from the short cross-process
+    hand-off window (SINGLE_FLIGHT_TTL).
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not SINGLE_FLIGHT_ENABLED:
+            return func(*args, **kwargs)
+
+        key = _flight_key(func, args, kwargs)
+        with _flights_lock:
+            flight = _flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _flights[key] = _Flight()
+
+        if not leader:
+            logger.info(f"Single-flight: waiting on in-flight call to {func.__qualname__}.")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = _call_across_processes(func, key, args, kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with _flights_lock:
+                del _flights[key]
+            flight.done.set()
+
+    return wrapper
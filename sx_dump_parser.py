@@ -0,0 +1,167 @@
+# sx_dump_parser.py
+#
+# Regenerates the sx/ co-tagging datasets from Stack Exchange data dumps.
+# Each site's Posts.xml is streamed with iterparse, so memory stays constant
+# in the number of posts: it grows only with the tag vocabulary and the
+# number of distinct tag pairs. Sites are spread across a process pool.
+#
+#   python sx_dump_parser.py path/to/dumps --workers 8
+#
+# The dump directory holds one extracted archive per site, e.g.
+# dumps/3dprinting.stackexchange.com/Posts.xml or dumps/superuser.com/Posts.xml.
+#
+# For every site this writes
+#   sx-cotagging-networks/networks/<site>_cotagging.csv           (t1, t2, ct)
+#   sx-cotagging-stats/sx-cotagging-stats/<site>_cotagging_stats.csv  (tag, ct, cotag, cotag_u)
+# and one dataset_stats.csv row (exchange, num_post, num_tag, unique_tag) to
+# each dataset's summary_statistics directory, merged with the rows of sites
+# parsed earlier and sorted by site. Tags are numbered from 1 in
+# order of first appearance.
+
+import os
+import argparse
+import logging
+import xml.etree.ElementTree as ET
+from collections import Counter
+from itertools import combinations
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = "sx"
+NETWORKS_DIR = os.path.join("sx-cotagging-networks", "networks")
+STATS_DIR = os.path.join("sx-cotagging-stats", "sx-cotagging-stats")
+SUMMARY_DIRS = [
+    os.path.join("sx-cotagging-networks", "summary_statistics"),
+    os.path.join("sx-cotagging-stats", "summary_statistics"),
+    os.path.join("sx-tag-question-parsed", "summary_statistics"),
+]
+QUESTION_POST_TYPE = "1"
+
+
+def parse_tags(tags):
+    """Split a Tags attribute: "<python><pandas>" in older dumps, "|python|pandas|" in newer ones."""
+    if tags.startswith("<"):
+        return tags[1:-1].split("><")
+    return [tag for tag in tags.split("|") if tag]
+
+
+def iter_question_tags(posts_path):
+    """Yield the tag list of every question in a Posts.xml, one row at a time."""
+    context = ET.iterparse(posts_path, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event == "end" and elem.tag == "row":
+            if elem.get("PostTypeId") == QUESTION_POST_TYPE:
+                tags = elem.get("Tags")
+                if tags:
+                    yield parse_tags(tags)
+            # Drop parsed rows so the tree never grows
+            root.clear()
+
+
+def count_cotagging(question_tags):
+    """Count per-tag questions and per-pair co-occurrences.
+
+    Returns (tag ids by name, question count per tag id, pair counts keyed by
+    (t1, t2) with t1 < t2, number of questions).
+    """
+    tag_ids = {}
+    tag_counts = Counter()
+    pair_counts = Counter()
+    num_post = 0
+
+    for tags in question_tags:
+        num_post += 1
+        ids = sorted({tag_ids.setdefault(tag, len(tag_ids) + 1) for tag in tags})
+        tag_counts.update(ids)
+        pair_counts.update(combinations(ids, 2))
+
+    return tag_ids, tag_counts, pair_counts, num_post
+
+
+def site_name(site_dir):
+    """Name used in the output files: 3dprinting.stackexchange.com -> 3dprinting, superuser.com stays."""
+    return site_dir.replace(".stackexchange.com", "")
+
+
+def process_site(job):
+    """Parse one site's dump and write its network and stats CSVs; return its summary row."""
+    posts_path, output_dir, exchange = job
+    tag_ids, tag_counts, pair_counts, num_post = count_cotagging(iter_question_tags(posts_path))
+
+    rows = [(t1, t2, ct) for (t1, t2), ct in sorted(pair_counts.items())]
+    edges = pd.DataFrame(np.array(rows, dtype=np.int64).reshape(-1, 3), columns=["t1", "t2", "ct"])
+
+    # cotag is a tag's weighted degree in the network, cotag_u its degree
+    tags = np.arange(1, len(tag_ids) + 1)
+    endpoints = np.concatenate([edges["t1"].to_numpy(), edges["t2"].to_numpy()])
+    weights = np.concatenate([edges["ct"].to_numpy(), edges["ct"].to_numpy()])
+    stats = pd.DataFrame({
+        "tag": tags,
+        "ct": [tag_counts[tag] for tag in tags],
+        "cotag": np.bincount(endpoints, weights=weights, minlength=len(tags) + 1)[1:].astype(np.int64),
+        "cotag_u": np.bincount(endpoints, minlength=len(tags) + 1)[1:]
+    })
+
+    edges.to_csv(os.path.join(output_dir, NETWORKS_DIR, f"{exchange}_cotagging.csv"))
+    stats.to_csv(os.path.join(output_dir, STATS_DIR, f"{exchange}_cotagging_stats.csv"))
+    logger.info(f"{exchange}: {num_post} questions, {len(tag_ids)} tags, {len(edges)} tag pairs.")
+    return {"exchange": exchange, "num_post": num_post, "num_tag": len(tag_ids), "unique_tag": len(tag_counts)}
+
+
+def find_sites(dump_dir):
+    """List (Posts.xml path, exchange name) for every site directory in dump_dir."""
+    sites = []
+    for entry in sorted(os.listdir(dump_dir)):
+        posts_path = os.path.join(dump_dir, entry, "Posts.xml")
+        if os.path.isfile(posts_path):
+            sites.append((posts_path, site_name(entry)))
+    return sites
+
+
+def regenerate(dump_dir, output_dir=OUTPUT_DIR, workers=None):
+    """Regenerate the co-tagging datasets for every site in dump_dir."""
+    for directory in [NETWORKS_DIR, STATS_DIR] + SUMMARY_DIRS:
+        os.makedirs(os.path.join(output_dir, directory), exist_ok=True)
+
+    jobs = [(posts_path, output_dir, exchange) for posts_path, exchange in find_sites(dump_dir)]
+    logger.info(f"Parsing {len(jobs)} sites from {dump_dir}.")
+
+    # Largest dumps first so they don't end up as the pool's stragglers
+    jobs.sort(key=lambda job: os.path.getsize(job[0]), reverse=True)
+    with Pool(workers) as pool:
+        summary = pd.DataFrame(list(pool.imap_unordered(process_site, jobs)),
+                               columns=["exchange", "num_post", "num_tag", "unique_tag"])
+    summary = summary.sort_values("exchange").reset_index(drop=True)
+
+    for directory in SUMMARY_DIRS:
+        path = os.path.join(output_dir, directory, "dataset_stats.csv")
+        merge_summary(path, summary).to_csv(path)
+    logger.info(f"Wrote summary statistics for {len(summary)} sites.")
+    return summary
+
+
+def merge_summary(path, summary):
+    """Combine summary rows with the sites already in the dataset_stats.csv at path, sorted by site.
+
+    Sites parsed in this run replace their old rows; sites not in this run keep theirs.
+    """
+    if os.path.exists(path):
+        existing = pd.read_csv(path, index_col=0)
+        summary = pd.concat([existing[~existing["exchange"].isin(summary["exchange"])], summary])
+    return summary.sort_values("exchange").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the sx/ co-tagging datasets from Stack Exchange dumps.")
+    parser.add_argument("dump_dir", help="Directory with one extracted dump per site")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Output root (default: sx)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    regenerate(args.dump_dir, args.output, args.workers)
@@ -0,0 +1,153 @@
+# tag_cooccurrence.py
+#
+# Builds the tag x tag co-occurrence matrix from questiontags and persists it,
+# so the dashboards can look up related tags without a per-click SQL self-join.
+# Rebuild after loading new questions:
+#
+#   python tag_cooccurrence.py
+#
+# When the incrementally maintained tag_pair_counts table exists (see
+# database/tag_pair_counts.sql), related_tags reads it instead, so the related
+# tags include questions loaded since the matrix was last built.
+
+import os
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import db_backend
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+COOCCURRENCE_FILE = "data/tag_cooccurrence.npz"
+PAIR_COUNTS_CHECK_TTL = 300  # Seconds before checking again whether tag_pair_counts exists
+
+# Loaded matrix, reloaded whenever the file on disk changes
+_loaded = {"mtime": None, "matrix": None, "names": None, "index": None}
+_pair_counts = {"checked_at": None, "available": False}
+
+
+def build_cooccurrence():
+    """Build the co-occurrence matrix from questiontags in one vectorized pass.
+
+    With A the question x tag incidence matrix, A.T @ A counts for every tag
+    pair the questions carrying both. The diagonal (a tag with itself) is
+    dropped.
+    """
+    pairs = db_backend.read_sql("SELECT question_id, tag_id FROM questiontags;")
+    logger.info(f"Fetched {len(pairs)} question-tag pairs.")
+
+    question_codes, question_ids = pd.factorize(pairs["question_id"])
+    tag_codes, tag_ids = pd.factorize(pairs["tag_id"], sort=True)
+    incidence = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (question_codes, tag_codes)),
+        shape=(len(question_ids), len(tag_ids))
+    )
+    cooccurrence = (incidence.T @ incidence).tocsr()
+    cooccurrence.setdiag(0)
+    cooccurrence.eliminate_zeros()
+
+    names = pd.Series(db_backend.tag_names(tag_ids)).astype(object).fillna("").to_numpy(dtype=str)
+
+    os.makedirs(os.path.dirname(COOCCURRENCE_FILE), exist_ok=True)
+    np.savez_compressed(
+        COOCCURRENCE_FILE,
+        data=cooccurrence.data,
+        indices=cooccurrence.indices,
+        indptr=cooccurrence.indptr,
+        shape=np.array(cooccurrence.shape),
+        tag_ids=np.asarray(tag_ids),
+        tag_names=names
+    )
+    logger.info(f"Saved {len(tag_ids)} x {len(tag_ids)} co-occurrence matrix "
+                f"with {cooccurrence.nnz} non-zero pairs to {COOCCURRENCE_FILE}.")
+
+
+def load_cooccurrence():
+    """Return (matrix, tag_names, name -> row index), or None if it hasn't been built."""
+    if not os.path.exists(COOCCURRENCE_FILE):
+        return None
+
+    mtime = os.path.getmtime(COOCCURRENCE_FILE)
+    if _loaded["mtime"] != mtime:
+        with np.load(COOCCURRENCE_FILE) as stored:
+            _loaded["matrix"] = sparse.csr_matrix(
+                (stored["data"], stored["indices"], stored["indptr"]), shape=tuple(stored["shape"])
+            )
+            _loaded["names"] = stored["tag_names"]
+        _loaded["index"] = {name: row for row, name in enumerate(_loaded["names"])}
+        _loaded["mtime"] = mtime
+        logger.info(f"Loaded co-occurrence matrix from {COOCCURRENCE_FILE}.")
+    return _loaded["matrix"], _loaded["names"], _loaded["index"]
+
+
+def pair_counts_available():
+    """Whether the tag_pair_counts table exists; only the Postgres backend has it."""
+    if db_backend.BACKEND != "postgres":
+        return False
+    checked_at = _pair_counts["checked_at"]
+    if checked_at is None or time.monotonic() - checked_at > PAIR_COUNTS_CHECK_TTL:
+        try:
+            present = db_backend.read_sql("SELECT to_regclass('tag_pair_counts') IS NOT NULL AS present;",
+                                          compact_frame=False)
+            _pair_counts["available"] = bool(present["present"].iloc[0])
+        except Exception as e:
+            logger.warning(f"Could not check for tag_pair_counts: {e}")
+            _pair_counts["available"] = False
+        _pair_counts["checked_at"] = time.monotonic()
+    return _pair_counts["available"]
+
+
+def related_tags_from_pair_counts(tag_name, top_n=10):
+    """Return the tags most often used together with tag_name, read from tag_pair_counts."""
+    # Each pair is stored once with t1 < t2, so the tag can be on either side
+    query = """
+    WITH tag AS (SELECT tag_id FROM tags WHERE name = %s),
+    pairs AS (
+        SELECT t2 AS tag_id, ct FROM tag_pair_counts JOIN tag ON tag_pair_counts.t1 = tag.tag_id
+        UNION ALL
+        SELECT t1 AS tag_id, ct FROM tag_pair_counts JOIN tag ON tag_pair_counts.t2 = tag.tag_id
+    )
+    SELECT tags.name AS tag_name, pairs.ct AS count
+    FROM pairs
+    JOIN tags ON pairs.tag_id = tags.tag_id
+    WHERE pairs.ct > 0
+    ORDER BY pairs.ct DESC, tags.name
+    LIMIT %s;
+    """
+    related = db_backend.read_sql(query, (tag_name, top_n), compact_frame=False)
+    return related.astype({"tag_name": object}).reset_index(drop=True)
+
+
+def related_tags(tag_name, top_n=10):
+    """Return the tags most often used together with tag_name, with their counts.
+
+    Reads tag_pair_counts when it exists, and the precomputed matrix otherwise.
+    """
+    if pair_counts_available():
+        return related_tags_from_pair_counts(tag_name, top_n)
+
+    loaded = load_cooccurrence()
+    if loaded is None:
+        logger.warning(f"No co-occurrence matrix found at {COOCCURRENCE_FILE}.")
+        return pd.DataFrame(columns=["tag_name", "count"])
+
+    matrix, names, index = loaded
+    row = index.get(tag_name)
+    if row is None:
+        return pd.DataFrame(columns=["tag_name", "count"])
+
+    # A CSR row holds exactly the tag's co-occurring tags
+    start, end = matrix.indptr[row], matrix.indptr[row + 1]
+    columns, counts = matrix.indices[start:end], matrix.data[start:end]
+    top = np.argsort(counts, kind="stable")[::-1][:top_n]
+    return pd.DataFrame({"tag_name": names[columns[top]], "count": counts[top]})
+
+
+if __name__ == "__main__":
+    build_cooccurrence()
@@ -0,0 +1,203 @@
+# tag_history.py
+#
+# Append-only history of tag counts. Every tags refresh appends one snapshot
+# of (tag_id, count) under HISTORY_DIR/date=YYYY-MM-DD/counts.npz:
+#
+#   tag_id_deltas  sorted tag_ids, delta-encoded (first value absolute)
+#   count_values   counts minus the previous snapshot's count for the same tag
+#                  (0 for new tags), or absolute counts in a keyframe
+#
+# A keyframe is written every KEYFRAME_INTERVAL snapshots, so reading any
+# snapshot replays at most KEYFRAME_INTERVAL - 1 deltas. Between consecutive
+# snapshots the stored deltas are the growth itself.
+
+import os
+import shutil
+import logging
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = os.path.join("data", "tag_history")
+KEYFRAME_INTERVAL = 30
+PARTITION_PREFIX = "date="
+DECODED_CACHE_SIZE = 8
+
+# Recently decoded snapshots: date -> (file mtime, (tag_ids, counts))
+_decoded = {}
+
+
+def list_snapshots():
+    """Snapshot dates (YYYY-MM-DD), oldest first."""
+    if not os.path.isdir(HISTORY_DIR):
+        return []
+    return sorted(name[len(PARTITION_PREFIX):] for name in os.listdir(HISTORY_DIR)
+                  if name.startswith(PARTITION_PREFIX) and not name.endswith(".part"))
+
+
+def _partition_path(snapshot_date):
+    return os.path.join(HISTORY_DIR, f"{PARTITION_PREFIX}{snapshot_date}")
+
+
+def _read_partition(snapshot_date):
+    """Raw stored arrays of one snapshot: (tag_ids, count values, is keyframe)."""
+    with np.load(os.path.join(_partition_path(snapshot_date), "counts.npz")) as stored:
+        tag_ids = np.cumsum(stored["tag_id_deltas"], dtype=np.int64)
+        return tag_ids, stored["count_values"].astype(np.int64), bool(stored["keyframe"])
+
+
+def _cached(snapshot_date):
+    """A decoded snapshot from the cache, unless its file has been rewritten since."""
+    entry = _decoded.get(snapshot_date)
+    if entry is None:
+        return None
+    mtime = os.path.getmtime(os.path.join(_partition_path(snapshot_date), "counts.npz"))
+    return entry[1] if entry[0] == mtime else None
+
+
+def _remember(snapshot_date, decoded):
+    _decoded.pop(snapshot_date, None)
+    if len(_decoded) >= DECODED_CACHE_SIZE:
+        _decoded.pop(next(iter(_decoded)))
+    mtime = os.path.getmtime(os.path.join(_partition_path(snapshot_date), "counts.npz"))
+    _decoded[snapshot_date] = (mtime, decoded)
+
+
+def _align(tag_ids, previous_ids, previous_counts):
+    """previous_counts reindexed to tag_ids (both id arrays sorted); 0 for tags not in previous_ids."""
+    aligned = np.zeros(len(tag_ids), dtype=np.int64)
+    if len(previous_ids):
+        positions = np.minimum(np.searchsorted(previous_ids, tag_ids), len(previous_ids) - 1)
+        found = previous_ids[positions] == tag_ids
+        aligned[found] = previous_counts[positions[found]]
+    return aligned
+
+
+def load_snapshot(snapshot_date):
+    """Return (tag_ids, counts) of a snapshot, replaying deltas from the latest keyframe."""
+    cached = _cached(snapshot_date)
+    if cached is not None:
+        return cached
+
+    snapshots = list_snapshots()
+    position = snapshots.index(snapshot_date)  # ValueError for unknown dates
+    # Walk back to the nearest decoded snapshot or keyframe, then replay forward
+    chain = []
+    for earlier in reversed(snapshots[:position + 1]):
+        cached = _cached(earlier)
+        if cached is not None:
+            tag_ids, counts = cached
+            break
+        stored = _read_partition(earlier)
+        chain.append((earlier, stored))
+        if stored[2]:
+            tag_ids, counts = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+            break
+    else:
+        raise ValueError(f"No keyframe found before snapshot {snapshot_date}.")
+
+    for earlier, (stored_ids, values, keyframe) in reversed(chain):
+        counts = values if keyframe else values + _align(stored_ids, tag_ids, counts)
+        tag_ids = stored_ids
+        _remember(earlier, (tag_ids, counts))
+    return tag_ids, counts
+
+
+def append_snapshot(tag_ids, counts, snapshot_date=None):
+    """Append a snapshot of tag counts, taken on snapshot_date (default today).
+
+    Rerunning on the date of the latest snapshot replaces it; dates before the
+    latest snapshot are rejected, as later deltas depend on them.
+    """
+    snapshot_date = snapshot_date or date.today().isoformat()
+    snapshots = list_snapshots()
+    if snapshots and snapshot_date < snapshots[-1]:
+        raise ValueError(f"Snapshot {snapshot_date} is older than the latest snapshot {snapshots[-1]}.")
+    previous = [earlier for earlier in snapshots if earlier < snapshot_date]
+
+    tag_ids = np.asarray(tag_ids, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    order = np.argsort(tag_ids, kind="stable")
+    tag_ids, counts = tag_ids[order], counts[order]
+
+    keyframe = len(previous) % KEYFRAME_INTERVAL == 0
+    if keyframe:
+        values = counts
+    else:
+        previous_ids, previous_counts = load_snapshot(previous[-1])
+        values = counts - _align(tag_ids, previous_ids, previous_counts)
+
+    # Write next to the final location, then swap in, so readers never see half a snapshot
+    path = _partition_path(snapshot_date)
+    staging = path + ".part"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    np.savez_compressed(
+        os.path.join(staging, "counts.npz"),
+        tag_id_deltas=np.diff(tag_ids, prepend=0).astype(np.int32),
+        count_values=values.astype(np.int32),
+        keyframe=np.bool_(keyframe)
+    )
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(staging, path)
+    _decoded.clear()
+    logger.info(f"Appended {'keyframe' if keyframe else 'delta'} snapshot {snapshot_date} with {len(tag_ids)} tags.")
+
+
+def growth(start_date, end_date):
+    """Growth of every tag present at end_date between two snapshots.
+
+    Returns a DataFrame of tag_id, start_count, end_count, change,
+    growth_rate (change / start_count, NaN for new tags) and daily_change.
+    """
+    start_ids, start_counts = load_snapshot(start_date)
+    end_ids, end_counts = load_snapshot(end_date)
+    before = _align(end_ids, start_ids, start_counts)
+    change = end_counts - before
+    days = max((date.fromisoformat(end_date) - date.fromisoformat(start_date)).days, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(before > 0, change / before, np.nan)
+    return pd.DataFrame({
+        "tag_id": end_ids,
+        "start_count": before,
+        "end_count": end_counts,
+        "change": change,
+        "growth_rate": rate,
+        "daily_change": change / days
+    })
+
+
+def risers_and_fallers(start_date, end_date, top_n=10, by="growth_rate", min_count=1000):
+    """Return (risers, fallers): the top_n tags with the highest and lowest growth.
+
+    Only tags with at least min_count questions at start_date are ranked, so
+    small tags do not dominate relative growth.
+    """
+    ranked = growth(start_date, end_date)
+    ranked = ranked[ranked["start_count"] >= min_count].dropna(subset=[by])
+    risers = ranked.nlargest(top_n, by)
+    fallers = ranked.nsmallest(top_n, by)
+    return risers.reset_index(drop=True), fallers.reset_index(drop=True)
+
+
+def count_history(tag_ids):
+    """Counts of the given tags in every snapshot, as a DataFrame of snapshot_date, tag_id, count."""
+    tag_ids = np.sort(np.asarray(tag_ids, dtype=np.int64))
+    frames = []
+    for snapshot_date in list_snapshots():
+        snapshot_ids, counts = load_snapshot(snapshot_date)
+        positions = np.minimum(np.searchsorted(snapshot_ids, tag_ids), max(len(snapshot_ids) - 1, 0))
+        found = (snapshot_ids[positions] == tag_ids) if len(snapshot_ids) else np.zeros(len(tag_ids), dtype=bool)
+        frames.append(pd.DataFrame({
+            "snapshot_date": pd.Timestamp(snapshot_date),
+            "tag_id": tag_ids[found],
+            "count": counts[positions[found]]
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["snapshot_date", "tag_id", "count"])
+    return pd.concat(frames, ignore_index=True)
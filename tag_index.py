@@ -0,0 +1,244 @@
+# tag_index.py
+#
+# Inverted index from tags to the questions carrying them, for boolean tag
+# queries such as "python AND pandas AND NOT numpy". Every tag's posting list
+# is a sorted uint32 array of question_ids, stored back to back in CSR form.
+# Question scores and view counts are held in NumPy arrays aligned with the
+# sorted question_ids. Rebuild after loading new questions:
+#
+#   python tag_index.py
+
+import os
+import re
+import logging
+
+import numpy as np
+import pandas as pd
+
+import db_backend
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "data/tag_index.npz"
+GALLOP_RATIO = 8  # Above this length ratio, intersect by binary search instead of merging
+
+# Loaded index, reloaded whenever the file on disk changes
+_loaded = {"mtime": None, "index": None}
+
+
+def build_index():
+    """Build the posting lists and question columns from questiontags and topvotedquestions."""
+    pairs = db_backend.read_sql("SELECT question_id, tag_id FROM questiontags;")
+    questions = db_backend.read_sql("SELECT question_id, score, view_count FROM topvotedquestions;")
+    logger.info(f"Fetched {len(pairs)} question-tag pairs and {len(questions)} questions.")
+
+    questions = questions.sort_values("question_id")
+    question_ids = questions["question_id"].to_numpy(dtype=np.uint32)
+    pair_questions = pairs["question_id"].to_numpy(dtype=np.uint32)
+    # Only questions we hold scores for can be returned
+    known = np.isin(pair_questions, question_ids)
+    tag_codes, tag_ids = pd.factorize(pairs["tag_id"][known], sort=True)
+    pair_questions = pair_questions[known]
+
+    # Group by tag, question_ids ascending within each tag
+    order = np.lexsort((pair_questions, tag_codes))
+    postings = pair_questions[order]
+    indptr = np.zeros(len(tag_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tag_codes, minlength=len(tag_ids)), out=indptr[1:])
+
+    names = pd.Series(db_backend.tag_names(tag_ids)).astype(object).fillna("").to_numpy(dtype=str)
+
+    os.makedirs(os.path.dirname(INDEX_FILE), exist_ok=True)
+    np.savez_compressed(
+        INDEX_FILE,
+        tag_names=names,
+        indptr=indptr,
+        postings=postings,
+        question_ids=question_ids,
+        scores=questions["score"].fillna(0).to_numpy(dtype=np.int32),
+        view_counts=questions["view_count"].fillna(0).to_numpy(dtype=np.int32)
+    )
+    logger.info(f"Saved posting lists for {len(tag_ids)} tags over {len(question_ids)} questions to {INDEX_FILE}.")
+
+
+def load_index():
+    """Return the index arrays plus a tag name -> posting list number map, or None if it hasn't been built."""
+    if not os.path.exists(INDEX_FILE):
+        return None
+
+    mtime = os.path.getmtime(INDEX_FILE)
+    if _loaded["mtime"] != mtime:
+        with np.load(INDEX_FILE) as stored:
+            index = {name: stored[name] for name in stored.files}
+        index["tags"] = {name: number for number, name in enumerate(index["tag_names"])}
+        _loaded["index"] = index
+        _loaded["mtime"] = mtime
+        logger.info(f"Loaded tag index from {INDEX_FILE}.")
+    return _loaded["index"]
+
+
+# Expression parsing
+#
+#   expression := term (OR term)*
+#   term       := factor ([AND] factor)*      adjacent tags are ANDed
+#   factor     := NOT factor | ( expression ) | tag
+#
+# Keywords are case-insensitive; tags are matched in lower case, so names such
+# as c++, .net and python-3.x can be written as they are.
+
+def tokenize(text):
+    return re.findall(r"[()]|[^\s()]+", text)
+
+
+def parse_expression(text):
+    """Parse a boolean tag expression into nested tuples: ("tag", name), ("not", x), ("and", [...]), ("or", [...])."""
+    tokens = tokenize(text)
+    position = 0
+
+    def peek():
+        return tokens[position].upper() if position < len(tokens) else None
+
+    def advance():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def expression():
+        terms = [term()]
+        while peek() == "OR":
+            advance()
+            terms.append(term())
+        return terms[0] if len(terms) == 1 else ("or", terms)
+
+    def term():
+        factors = [factor()]
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                advance()
+            factors.append(factor())
+        return factors[0] if len(factors) == 1 else ("and", factors)
+
+    def factor():
+        token = peek()
+        if token is None:
+            raise ValueError("Expression ends unexpectedly.")
+        if token == "NOT":
+            advance()
+            return ("not", factor())
+        if token == "(":
+            advance()
+            node = expression()
+            if peek() != ")":
+                raise ValueError("Missing closing parenthesis.")
+            advance()
+            return node
+        if token in ("AND", "OR", ")"):
+            raise ValueError(f"Unexpected '{tokens[position]}'.")
+        return ("tag", advance().lower())
+
+    if not tokens:
+        raise ValueError("Enter at least one tag.")
+    tree = expression()
+    if position < len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position]}'.")
+    return tree
+
+
+# Posting list algebra on sorted, duplicate-free uint32 arrays
+
+def intersect(a, b):
+    """Intersection of two sorted posting lists."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return a
+    if len(b) > GALLOP_RATIO * len(a):
+        # Look each element of the short list up in the long one
+        positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+        return a[b[positions] == a]
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def union(lists):
+    """Union of any number of sorted posting lists."""
+    if not lists:
+        return np.empty(0, dtype=np.uint32)
+    return np.unique(np.concatenate(lists))
+
+
+def difference(a, b):
+    """Elements of posting list a not in b."""
+    if len(a) == 0 or len(b) == 0:
+        return a
+    positions = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[positions] != a]
+
+
+def evaluate(tree, index):
+    """Evaluate a parsed expression to the sorted question_ids it matches."""
+    kind = tree[0]
+    if kind == "tag":
+        number = index["tags"].get(tree[1])
+        if number is None:
+            return np.empty(0, dtype=np.uint32)
+        return index["postings"][index["indptr"][number]:index["indptr"][number + 1]]
+    if kind == "or":
+        return union([evaluate(child, index) for child in tree[1]])
+    if kind == "not":
+        return difference(index["question_ids"], evaluate(tree[1], index))
+
+    # AND: intersect the positive lists shortest first, then subtract the negated ones
+    positives = [evaluate(child, index) for child in tree[1] if child[0] != "not"]
+    negatives = [evaluate(child[1], index) for child in tree[1] if child[0] == "not"]
+    if positives:
+        positives.sort(key=len)
+        result = positives[0]
+        for posting in positives[1:]:
+            if len(result) == 0:
+                break
+            result = intersect(result, posting)
+    else:
+        result = index["question_ids"]
+    for posting in negatives:
+        result = difference(result, posting)
+    return result
+
+
+def query_questions(expression, order_by="score", limit=25):
+    """Return (match count, top questions) for a boolean tag expression.
+
+    The top questions are a DataFrame of question_id, score and view_count,
+    ordered by order_by ("score" or "view_count"). Raises ValueError for a
+    malformed expression.
+    """
+    tree = parse_expression(expression)
+    empty = pd.DataFrame({"question_id": [], "score": [], "view_count": []})
+    index = load_index()
+    if index is None:
+        logger.warning(f"No tag index found at {INDEX_FILE}.")
+        return 0, empty
+
+    matches = evaluate(tree, index)
+    if len(matches) == 0:
+        return 0, empty
+
+    # question_ids are sorted and every posting is present, so this is an exact join
+    rows = np.searchsorted(index["question_ids"], matches)
+    scores, view_counts = index["scores"][rows], index["view_counts"][rows]
+    keys = scores if order_by == "score" else view_counts
+    if len(rows) > limit:
+        top = np.argpartition(-keys.astype(np.int64), limit - 1)[:limit]
+    else:
+        top = np.arange(len(rows))
+    top = top[np.argsort(-keys[top].astype(np.int64), kind="stable")]
+    return len(matches), pd.DataFrame({
+        "question_id": matches[top].astype(np.int64),
+        "score": scores[top],
+        "view_count": view_counts[top]
+    })
+
+
+if __name__ == "__main__":
+    build_index()
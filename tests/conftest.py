@@ -0,0 +1,81 @@
+# The project modules live at the repository root rather than in a package
+import os
+import sys
+import asyncio
+import threading
+import importlib.util
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load_mock_api():
+    """Import mock-api.py, whose name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location("mock_api", os.path.join(ROOT, "mock-api.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class MockServer:
+    """A MockStackExchange served on a free local port from a background thread."""
+
+    def __init__(self, mock_api, mock):
+        from aiohttp import web
+
+        self.mock = mock
+        self.requests = []  # Query strings of every request received, in order
+
+        @web.middleware
+        async def record(request, handler):
+            self.requests.append(request.query_string)
+            return await handler(request)
+
+        self.app = mock_api.create_app(mock)
+        self.app.middlewares.append(record)
+        self.loop = asyncio.new_event_loop()
+        self.started = threading.Event()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        self.started.wait(timeout=10)
+        self.url = f"http://127.0.0.1:{self.port}/2.3"
+
+    def serve(self):
+        from aiohttp import web
+
+        asyncio.set_event_loop(self.loop)
+        self.runner = web.AppRunner(self.app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.started.set()
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+
+
+@pytest.fixture
+def mock_api():
+    return load_mock_api()
+
+
+@pytest.fixture
+def mock_server(mock_api):
+    """Factory starting MockServers with the given MockStackExchange arguments; all are stopped afterwards."""
+    servers = []
+
+    def start(seed=550, num_tags=1000, num_questions=1000, max_page=100):
+        server = MockServer(mock_api, mock_api.MockStackExchange(seed, num_tags, num_questions, 0, 0, 0, max_page))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
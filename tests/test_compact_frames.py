@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import db_backend
+
+NUM_ROWS = 100000
+NUM_TAGS = 500
+
+
+@pytest.fixture
+def frame():
+    """A questions x tags frame as the backend returns it: int64 ids and counts, object names."""
+    rng = np.random.default_rng(550)
+    tag_ids = rng.integers(1, NUM_TAGS + 1, NUM_ROWS)
+    return pd.DataFrame({
+        "question_id": np.arange(1, NUM_ROWS + 1, dtype=np.int64),
+        "tag_id": tag_ids.astype(np.int64),
+        "score": rng.integers(-10, 10000, NUM_ROWS).astype(np.int64),
+        "view_count": rng.integers(0, 10**6, NUM_ROWS).astype(np.int64),
+        "tag_name": [f"tag-{tag_id}" for tag_id in tag_ids],
+        "creation_date": pd.date_range("2021-01-01", periods=NUM_ROWS, freq="min"),
+    })
+
+
+@pytest.fixture
+def dictionary(monkeypatch):
+    """A loaded tag dictionary, so tag_names needs no database."""
+    ids = np.array([3, 5, 9], dtype=np.int64)
+    monkeypatch.setitem(db_backend._tag_dictionary, "ids", ids)
+    monkeypatch.setitem(db_backend._tag_dictionary, "dtype", pd.CategoricalDtype(["c", "e", "i"]))
+    monkeypatch.setitem(db_backend._tag_dictionary, "loaded_at", time.monotonic())
+    return ids
+
+
+def test_compact_dtypes(frame):
+    compacted = db_backend.compact(frame.copy())
+    for column in ["question_id", "tag_id", "score", "view_count"]:
+        assert compacted[column].dtype == np.int32
+    assert isinstance(compacted["tag_name"].dtype, pd.CategoricalDtype)
+    assert len(compacted["tag_name"].cat.categories) == NUM_TAGS
+    # Other columns are left alone
+    assert compacted["creation_date"].dtype == frame["creation_date"].dtype
+    assert (compacted["tag_name"].astype(object) == frame["tag_name"]).all()
+    assert (compacted["score"] == frame["score"]).all()
+
+
+def test_compact_memory_bound(frame):
+    before = frame.memory_usage(deep=True).sum()
+    after = db_backend.compact(frame.copy()).memory_usage(deep=True).sum()
+    # 4 x int32 + int16 codes + int64 timestamps per row, plus the categories and the index
+    assert after <= 26 * NUM_ROWS + 100000
+    assert after < 0.4 * before
+
+
+def test_compact_keeps_columns_with_nulls(frame):
+    frame["score"] = frame["score"].astype(np.float64)
+    frame.loc[0, "score"] = np.nan
+    compacted = db_backend.compact(frame)
+    assert compacted["score"].dtype == np.float64
+    assert compacted["tag_id"].dtype == np.int32
+
+
+def test_tag_names_share_the_dictionary(dictionary):
+    names = db_backend.tag_names([9, 3, 4, 5])
+    assert list(names.astype(object)[:2]) == ["i", "c"]
+    assert pd.isna(names[2])
+    assert names[3] == "e"
+    assert names.dtype == db_backend._tag_dictionary["dtype"]
+    assert names.codes.dtype.itemsize <= 2
+
+
+def test_tag_names_empty_dictionary(monkeypatch):
+    monkeypatch.setitem(db_backend._tag_dictionary, "ids", np.empty(0, dtype=np.int64))
+    monkeypatch.setitem(db_backend._tag_dictionary, "dtype", pd.CategoricalDtype([]))
+    monkeypatch.setitem(db_backend._tag_dictionary, "loaded_at", time.monotonic())
+    assert pd.isna(db_backend.tag_names([1, 2])).all()
+
+
+def test_read_sql_returns_compact_frames(frame, tmp_path, monkeypatch):
+    pytest.importorskip("duckdb")
+    pytest.importorskip("pyarrow")
+    for table in db_backend.TABLES:
+        frame.to_parquet(tmp_path / f"{table}.parquet", index=False)
+    monkeypatch.setattr(db_backend, "COMPACT_FRAMES", True)
+    backend, export_dir = db_backend.BACKEND, db_backend.EXPORT_DIR
+    db_backend.configure(backend="duckdb", export_dir=str(tmp_path))
+    try:
+        result = db_backend.read_sql("SELECT question_id, tag_id, tag_name FROM questiontags WHERE score > %s", (0,))
+        assert result["question_id"].dtype == np.int32
+        assert result["tag_id"].dtype == np.int32
+        assert isinstance(result["tag_name"].dtype, pd.CategoricalDtype)
+        assert len(result) == (frame["score"] > 0).sum()
+
+        raw = db_backend.read_sql("SELECT question_id FROM questiontags", compact_frame=False)
+        assert raw["question_id"].dtype != np.int32
+    finally:
+        db_backend.configure(backend=backend, export_dir=export_dir)
@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+import crawl_questions
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    """Point the crawler's state, shards and log at tmp_path, with small pages and no request spacing."""
+    output_dir = tmp_path / "shards"
+    monkeypatch.setattr(crawl_questions, "OUTPUT_DIR", str(output_dir))
+    monkeypatch.setattr(crawl_questions, "STATE_FILE", str(output_dir / "crawl_state.sqlite3"))
+    monkeypatch.setattr(crawl_questions, "LOG_FILE", str(tmp_path / "log.txt"))
+    monkeypatch.setattr(crawl_questions, "REQUEST_INTERVAL", 0)
+    monkeypatch.setattr(crawl_questions, "WORKERS", 2)
+    return output_dir
+
+
+def crawl(server, monkeypatch, end_date, page_size, max_pages):
+    monkeypatch.setattr(crawl_questions, "BASE_URL", f"{server.url}/questions")
+    monkeypatch.setattr(crawl_questions, "PAGE_SIZE", page_size)
+    monkeypatch.setattr(crawl_questions, "MAX_PAGES", max_pages)
+    crawl_questions.crawl(end_date)
+
+
+def stored_question_ids(output_dir):
+    question_ids = []
+    for name in sorted(os.listdir(output_dir)):
+        assert not name.endswith(".part")
+        if name.endswith(".jsonl.gz"):
+            with gzip.open(output_dir / name, "rt", encoding="utf-8") as shard:
+                question_ids += [json.loads(line)["question_id"] for line in shard]
+    return question_ids
+
+
+def check_crawl(server, output_dir, end):
+    """Every question up to end is stored exactly once, and no request was sent twice."""
+    lo, hi = server.mock.question_range(int(crawl_questions.START_DATE.timestamp()), end - 1)
+    question_ids = stored_question_ids(output_dir)
+    assert sorted(question_ids) == list(range(lo + 1, hi + 1))
+
+    assert len(set(server.requests)) == len(server.requests)
+    state = crawl_questions.connect_state()
+    try:
+        assert state.execute("SELECT used FROM quota").fetchone()[0] == len(server.requests)
+        assert state.execute("SELECT COUNT(*) FROM windows WHERE status != 'done'").fetchone()[0] == 0
+        # The done windows tile the crawled range without overlaps
+        windows = state.execute("SELECT fromdate, todate FROM windows ORDER BY fromdate").fetchall()
+        assert all(previous[1] + 1 == following[0] for previous, following in zip(windows, windows[1:]))
+        assert state.execute("SELECT SUM(items) FROM windows").fetchone()[0] == len(question_ids)
+    finally:
+        state.close()
+
+
+def test_crawl_continues_busy_windows(crawler, mock_server, monkeypatch):
+    # About one question every two days: windows hold ~15 questions, more than 2 pages of 5
+    server = mock_server(num_questions=3000)
+    end_date = datetime(2010, 1, 1, tzinfo=timezone.utc)
+    crawl(server, monkeypatch, end_date, page_size=5, max_pages=2)
+    check_crawl(server, crawler, int(end_date.timestamp()))
+
+
+def test_crawl_keeps_questions_sharing_a_second(crawler, mock_server, monkeypatch):
+    # Several questions per second, so windows are often cut inside a second
+    server = mock_server(num_questions=2000000000)
+    end = int(crawl_questions.START_DATE.timestamp()) + 60
+    crawl(server, monkeypatch, datetime.fromtimestamp(end, timezone.utc), page_size=7, max_pages=3)
+    check_crawl(server, crawler, end)
+
+
+def test_rerun_sends_no_requests(crawler, mock_server, monkeypatch):
+    server = mock_server(num_questions=3000)
+    end_date = datetime(2009, 1, 1, tzinfo=timezone.utc)
+    crawl(server, monkeypatch, end_date, page_size=5, max_pages=2)
+    sent = len(server.requests)
+    crawl(server, monkeypatch, end_date, page_size=5, max_pages=2)
+    assert len(server.requests) == sent
+    check_crawl(server, crawler, int(end_date.timestamp()))
@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+
+def get(server, path, **params):
+    response = requests.get(f"{server.url}/{path}", params=params, timeout=10)
+    return response.status_code, response.json()
+
+
+def test_same_seed_same_pages(mock_server):
+    first, second = mock_server(seed=7), mock_server(seed=7)
+    for path, params in [("tags", {"page": 2, "pagesize": 50}),
+                         ("questions", {"page": 3, "pagesize": 20, "sort": "creation", "order": "asc"}),
+                         ("questions", {"page": 1, "pagesize": 100, "sort": "votes"})]:
+        status, body = get(first, path, **params)
+        assert status == 200
+        assert get(second, path, **params)[1]["items"] == body["items"]
+
+
+def test_different_seed_different_questions(mock_server):
+    first, second = mock_server(seed=7), mock_server(seed=8)
+    params = {"pagesize": 100, "sort": "creation", "order": "asc"}
+    first_tags = [item["tags"] for item in get(first, "questions", **params)[1]["items"]]
+    second_tags = [item["tags"] for item in get(second, "questions", **params)[1]["items"]]
+    assert first_tags != second_tags
+
+
+def test_paging_and_has_more(mock_server):
+    server = mock_server(num_questions=250)
+    pages = [get(server, "questions", page=page, pagesize=100, sort="creation", order="asc")[1] for page in (1, 2, 3, 4)]
+    assert [len(body["items"]) for body in pages] == [100, 100, 50, 0]
+    assert [body["has_more"] for body in pages] == [True, True, False, False]
+    question_ids = [item["question_id"] for body in pages for item in body["items"]]
+    assert question_ids == list(range(1, 251))
+    assert [body["quota_remaining"] for body in pages] == [9999, 9998, 9997, 9996]
+
+
+def test_exact_last_page_has_no_more(mock_server):
+    server = mock_server(num_questions=200)
+    body = get(server, "questions", page=2, pagesize=100)[1]
+    assert len(body["items"]) == 100 and not body["has_more"]
+
+
+def test_vote_order_covers_every_question_once(mock_server):
+    server = mock_server(num_questions=250)
+    items = [item for page in (1, 2, 3)
+             for item in get(server, "questions", page=page, pagesize=100, sort="votes")[1]["items"]]
+    assert sorted(item["question_id"] for item in items) == list(range(1, 251))
+    scores = [item["score"] for item in items]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_date_window(mock_server, mock_api):
+    server = mock_server(num_questions=1000)
+    fromdate = mock_api.START_DATE + (mock_api.END_DATE - mock_api.START_DATE) // 4
+    todate = mock_api.START_DATE + (mock_api.END_DATE - mock_api.START_DATE) // 2
+    items = []
+    for page in range(1, 10):
+        body = get(server, "questions", page=page, pagesize=100, fromdate=fromdate, todate=todate,
+                   sort="creation", order="asc")[1]
+        items += body["items"]
+        if not body["has_more"]:
+            break
+    lo, hi = server.mock.question_range(fromdate, todate)
+    assert len(items) == hi - lo
+    assert all(fromdate <= item["creation_date"] <= todate for item in items)
+    dates = [item["creation_date"] for item in items]
+    assert dates == sorted(dates)
+
+
+@pytest.mark.parametrize("params", [
+    {"fromdate": "abc"},
+    {"todate": "2024-01-01"},
+    {"page": "two"},
+    {"pagesize": 0},
+    {"pagesize": 101},
+    {"page": 0},
+    {"page": 101},
+])
+def test_bad_parameters_cost_no_quota(mock_server, params):
+    server = mock_server()
+    status, body = get(server, "questions", **params)
+    assert status == 400
+    assert body["error_id"] == 400 and body["error_name"] == "bad_parameter"
+    # The rejected request did not count against the quota
+    assert get(server, "questions")[1]["quota_remaining"] == 9999
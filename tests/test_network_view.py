@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+import build_network_layouts
+import data_fetcher_network
+from build_network_layouts import EDGES_PER_NODE, MAX_BACKBONE_EDGES
+
+# Larger than the biggest sx/ site (superuser.com, ~230k edges before pruning)
+NUM_NODES = 60000
+NUM_EDGES = EDGES_PER_NODE * NUM_NODES + MAX_BACKBONE_EDGES
+
+
+@pytest.fixture
+def layout_dir(tmp_path, monkeypatch):
+    """Write a synthetic layout the size of the largest backbone, shaped like build_layout's output."""
+    rng = np.random.default_rng(550)
+    edge_weight = np.sort(rng.integers(1, 10000, NUM_EDGES, dtype=np.int32))[::-1]
+    np.savez_compressed(
+        tmp_path / "big.npz",
+        nodes=np.arange(1, NUM_NODES + 1, dtype=np.int32),
+        positions=(rng.random((NUM_NODES, 2)) * 250).astype(np.float32),
+        node_weight=rng.integers(1, 100000, NUM_NODES, dtype=np.int32),
+        edges=rng.integers(0, NUM_NODES, (NUM_EDGES, 2), dtype=np.int32),
+        edge_weight=edge_weight,
+        total_edges=np.int64(4 * NUM_EDGES)
+    )
+    monkeypatch.setattr(data_fetcher_network, "LAYOUT_DIR", str(tmp_path))
+    data_fetcher_network.load_layout.cache_clear()
+    yield tmp_path
+    data_fetcher_network.load_layout.cache_clear()
+
+
+def test_overview_respects_budgets(layout_dir):
+    view = data_fetcher_network.fetch_network_view("big")
+    assert view["shown_edges"] == data_fetcher_network.OVERVIEW_MAX_EDGES
+    assert len(view["node_x"]) == data_fetcher_network.OVERVIEW_MAX_NODES
+    assert len(view["edge_x"]) == 3 * view["shown_edges"]
+    assert view["backbone_edges"] == NUM_EDGES
+
+
+def test_zoomed_view_only_shows_viewport(layout_dir):
+    view = data_fetcher_network.fetch_network_view("big", x_range=[0, 50], y_range=[0, 50])
+    assert 0 < view["shown_edges"] <= data_fetcher_network.ZOOMED_MAX_EDGES
+    assert ((view["node_x"] >= 0) & (view["node_x"] <= 50)).all()
+    assert ((view["node_y"] >= 0) & (view["node_y"] <= 50)).all()
+
+
+def test_missing_site_returns_none(layout_dir):
+    assert data_fetcher_network.fetch_network_view("missing") is None
+
+
+# A small co-tagging network (t1, t2, ct) with two components once pruned
+SMALL_EDGES = pd.DataFrame([
+    (1, 2, 10), (1, 3, 9), (2, 3, 7), (3, 4, 2), (4, 5, 3), (5, 6, 1), (6, 7, 5), (1, 4, 4)
+], columns=["t1", "t2", "ct"], dtype=np.int32)
+# Weighted degree on the full network: 1 -> 23, 3 -> 18, 2 -> 17, 4 -> 9, 6 -> 6, 7 -> 5, 5 -> 4
+
+
+@pytest.fixture
+def small_backbone(monkeypatch):
+    monkeypatch.setattr(build_network_layouts, "EDGES_PER_NODE", 1)
+    monkeypatch.setattr(build_network_layouts, "MAX_BACKBONE_EDGES", 3)
+
+
+@pytest.mark.parametrize("max_backbone_edges, kept", [
+    # Each node's strongest edge: 1-2, 1-3, 4-5 (for 5), 6-7, 1-4 (for 4)
+    (0, [0, 1, 4, 6, 7]),
+    # The three heaviest add 2-3
+    (3, [0, 1, 2, 4, 6, 7]),
+    (len(SMALL_EDGES), list(range(len(SMALL_EDGES)))),
+])
+def test_backbone_keeps_expected_edges(small_backbone, monkeypatch, max_backbone_edges, kept):
+    monkeypatch.setattr(build_network_layouts, "MAX_BACKBONE_EDGES", max_backbone_edges)
+    assert sorted(build_network_layouts.prune_backbone(SMALL_EDGES).index) == kept
+
+
+def test_layout_positions_finite_and_separate(small_backbone):
+    backbone = build_network_layouts.prune_backbone(SMALL_EDGES)
+    nodes, positions = build_network_layouts.layout_network(backbone)
+    assert nodes.tolist() == [1, 2, 3, 4, 5, 6, 7]
+    assert positions.shape == (7, 2) and positions.dtype == np.float32
+    assert np.isfinite(positions).all()
+    # 5-6 was pruned, so {1..5} and {6, 7} are packed side by side without overlapping
+    big, small = positions[:5], positions[5:]
+    assert big[:, 0].max() < small[:, 0].min() or big[:, 1].min() > small[:, 1].max()
+    # Layouts are reproducible
+    assert (build_network_layouts.layout_network(backbone)[1] == positions).all()
+
+
+@pytest.mark.parametrize("num_nodes", [1, 2, 5, build_network_layouts.DENSE_EIGEN_LIMIT + 36])
+def test_spectral_positions(num_nodes):
+    # A ring with chords, large enough in the last case to use the sparse eigensolver
+    rows = np.arange(num_nodes)
+    adjacency = sparse.coo_matrix((np.ones(2 * num_nodes), (np.concatenate([rows, rows]),
+                                   np.concatenate([(rows + 1) % num_nodes, (rows + 7) % num_nodes]))),
+                                  shape=(num_nodes, num_nodes)).tocsr()
+    adjacency = adjacency + adjacency.T
+    positions = build_network_layouts.spectral_positions(adjacency)
+    assert positions.shape == (num_nodes, 2)
+    assert np.isfinite(positions).all()
+    if num_nodes > 2:
+        assert np.abs(positions).max() == pytest.approx(1.0)
+        assert np.allclose(positions.mean(axis=0), 0, atol=1e-9)
+        assert len(np.unique(positions.round(6), axis=0)) > 1
+
+
+@pytest.fixture
+def small_layout(small_backbone, tmp_path, monkeypatch):
+    """build_layout's output for SMALL_EDGES, loaded by the fetcher."""
+    networks_dir, layout_dir = tmp_path / "networks", tmp_path / "layouts"
+    networks_dir.mkdir()
+    layout_dir.mkdir()
+    SMALL_EDGES.to_csv(networks_dir / "small_cotagging.csv")
+    monkeypatch.setattr(build_network_layouts, "NETWORKS_DIR", str(networks_dir))
+    monkeypatch.setattr(build_network_layouts, "LAYOUT_DIR", str(layout_dir))
+    monkeypatch.setattr(data_fetcher_network, "LAYOUT_DIR", str(layout_dir))
+    monkeypatch.setattr(data_fetcher_network, "OVERVIEW_MAX_NODES", 3)
+    monkeypatch.setattr(data_fetcher_network, "OVERVIEW_MAX_EDGES", 2)
+    build_network_layouts.build_layout("small")
+    data_fetcher_network.load_layout.cache_clear()
+    yield data_fetcher_network.load_layout("small")
+    data_fetcher_network.load_layout.cache_clear()
+
+
+def test_overview_level_of_detail(small_layout):
+    view = data_fetcher_network.fetch_network_view("small")
+    # The three tags with the highest weighted degree, and the two heaviest edges
+    assert sorted(view["node_tag"].tolist()) == [1, 2, 3]
+    assert view["shown_edges"] == 2
+    assert (view["backbone_edges"], view["total_edges"]) == (6, 8)
+    assert small_layout["edge_weight"][:2].tolist() == [10, 9]
+
+
+def test_zoomed_level_of_detail(small_layout):
+    positions = small_layout["positions"][small_layout["nodes"] >= 6]
+    view = data_fetcher_network.fetch_network_view(
+        "small", x_range=[positions[:, 0].min(), positions[:, 0].max()],
+        y_range=[positions[:, 1].min(), positions[:, 1].max()])
+    assert sorted(view["node_tag"].tolist()) == [6, 7]
+    assert view["shown_edges"] == 1
@@ -0,0 +1,138 @@
+import threading
+import time
+
+import diskcache
+import pytest
+
+import single_flight
+
+NUM_CALLERS = 8
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    """A private on-disk cache, with coalescing switched on."""
+    private = diskcache.Cache(str(tmp_path / "cache"))
+    monkeypatch.setattr(single_flight, "cache", private)
+    monkeypatch.setattr(single_flight, "SINGLE_FLIGHT_ENABLED", True)
+    yield private
+    private.close()
+
+
+def run_concurrently(call, count=NUM_CALLERS):
+    """Call call() from count threads at once; return each thread's result or exception."""
+    outcomes = [None] * count
+    start = threading.Barrier(count)
+
+    def worker(number):
+        start.wait()
+        try:
+            outcomes[number] = call()
+        except Exception as e:
+            outcomes[number] = e
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return outcomes
+
+
+def test_concurrent_identical_calls_run_once():
+    calls = []
+
+    @single_flight.single_flight
+    def fetch(collectives, start_date):
+        calls.append((collectives, start_date))
+        time.sleep(0.2)  # Long enough for every caller to queue up
+        return {"rows": len(calls)}
+
+    outcomes = run_concurrently(lambda: fetch(["Python", "R Language"], "2021-01-01"))
+    assert len(calls) == 1
+    assert outcomes == [{"rows": 1}] * NUM_CALLERS
+    assert single_flight._flights == {}
+
+
+def test_finished_result_reused_within_ttl(monkeypatch):
+    monkeypatch.setattr(single_flight, "SINGLE_FLIGHT_TTL", 0.5)
+    calls = []
+
+    @single_flight.single_flight
+    def fetch(tag):
+        calls.append(tag)
+        return len(calls)
+
+    # A caller that was queued on another process's lock picks up the stored result
+    assert fetch("python") == 1
+    assert fetch("python") == 1
+    time.sleep(0.6)
+    assert fetch("python") == 2
+    assert calls == ["python", "python"]
+
+
+def test_different_args_not_coalesced():
+    calls = []
+    lock = threading.Lock()
+
+    @single_flight.single_flight
+    def fetch(tag, limit=10):
+        with lock:
+            calls.append((tag, limit))
+        time.sleep(0.1)
+        return (tag, limit)
+
+    outcomes = run_concurrently(lambda: fetch("python"), count=3)
+    outcomes += run_concurrently(lambda: fetch("pandas"), count=3)
+    outcomes.append(fetch("python", limit=5))
+    assert sorted(calls) == [("pandas", 10), ("python", 5), ("python", 10)]
+    assert outcomes == [("python", 10)] * 3 + [("pandas", 10)] * 3 + [("python", 5)]
+
+
+def test_list_and_tuple_args_share_a_key():
+    calls = []
+
+    @single_flight.single_flight
+    def fetch(tags):
+        calls.append(tags)
+        return len(tags)
+
+    assert fetch(["python", "r"]) == 2
+    assert fetch(("python", "r")) == 2
+    assert len(calls) == 1
+
+
+def test_exception_reaches_every_waiter_without_poisoning_the_key():
+    calls = []
+    failing = threading.Event()
+    failing.set()
+
+    @single_flight.single_flight
+    def fetch(tag):
+        calls.append(tag)
+        time.sleep(0.2)
+        if failing.is_set():
+            raise RuntimeError(f"database unavailable for {tag}")
+        return tag.upper()
+
+    outcomes = run_concurrently(lambda: fetch("python"))
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert {str(outcome) for outcome in outcomes} == {"database unavailable for python"}
+    assert single_flight._flights == {}
+
+    # The failure is not stored, so the next call runs the query again
+    failing.clear()
+    assert fetch("python") == "PYTHON"
+    assert len(calls) >= 2
+
+
+def test_disabled_calls_through(monkeypatch):
+    monkeypatch.setattr(single_flight, "SINGLE_FLIGHT_ENABLED", False)
+    calls = []
+
+    @single_flight.single_flight
+    def fetch(tag):
+        calls.append(tag)
+        return len(calls)
+
+    assert [fetch("python") for _ in range(3)] == [1, 2, 3]
@@ -0,0 +1,112 @@
+import os
+
+import pandas as pd
+import pytest
+
+import sx_dump_parser
+
+# Older dumps write Tags as <a><b>, newer ones as |a|b|; answers (PostTypeId 2) carry no tags
+POSTS = {
+    "angled.stackexchange.com": [
+        '<row Id="1" PostTypeId="1" Tags="&lt;python&gt;&lt;pandas&gt;" />',
+        '<row Id="2" PostTypeId="2" ParentId="1" />',
+        '<row Id="3" PostTypeId="1" Tags="&lt;python&gt;&lt;numpy&gt;&lt;pandas&gt;" />',
+        '<row Id="4" PostTypeId="1" Tags="&lt;numpy&gt;" />',
+    ],
+    "piped.com": [
+        '<row Id="1" PostTypeId="1" Tags="|rust|cargo|" />',
+        '<row Id="2" PostTypeId="1" Tags="|rust|" />',
+    ],
+    "empty.stackexchange.com": [
+        '<row Id="1" PostTypeId="2" ParentId="7" />',
+    ],
+}
+
+
+def write_dump(dump_dir):
+    for site, rows in POSTS.items():
+        os.makedirs(dump_dir / site)
+        (dump_dir / site / "Posts.xml").write_text(
+            '<?xml version="1.0" encoding="utf-8"?>\n<posts>\n' + "\n".join(rows) + "\n</posts>\n")
+        (dump_dir / site / "Tags.xml").write_text('<?xml version="1.0" encoding="utf-8"?>\n<tags>\n</tags>\n')
+
+
+@pytest.fixture
+def dump_dir(tmp_path):
+    write_dump(tmp_path / "dumps")
+    return tmp_path / "dumps"
+
+
+def read_csv(output_dir, directory, name):
+    return pd.read_csv(os.path.join(output_dir, directory, name), index_col=0)
+
+
+@pytest.mark.parametrize("tags, expected", [
+    ("<python><pandas>", ["python", "pandas"]),
+    ("|python|pandas|", ["python", "pandas"]),
+    ("<c++>", ["c++"]),
+    ("|c#|", ["c#"]),
+])
+def test_parse_tags_reads_both_formats(tags, expected):
+    assert sx_dump_parser.parse_tags(tags) == expected
+
+
+def test_regenerate_writes_networks_and_stats(dump_dir, tmp_path):
+    output_dir = tmp_path / "sx"
+    sx_dump_parser.regenerate(str(dump_dir), str(output_dir), workers=2)
+
+    # Tags are numbered in order of first appearance: python=1, pandas=2, numpy=3
+    edges = read_csv(output_dir, sx_dump_parser.NETWORKS_DIR, "angled_cotagging.csv")
+    assert edges.values.tolist() == [[1, 2, 2], [1, 3, 1], [2, 3, 1]]
+    stats = read_csv(output_dir, sx_dump_parser.STATS_DIR, "angled_cotagging_stats.csv")
+    assert stats.values.tolist() == [[1, 2, 3, 2], [2, 2, 3, 2], [3, 2, 2, 2]]
+
+    edges = read_csv(output_dir, sx_dump_parser.NETWORKS_DIR, "piped.com_cotagging.csv")
+    assert edges.values.tolist() == [[1, 2, 1]]
+    stats = read_csv(output_dir, sx_dump_parser.STATS_DIR, "piped.com_cotagging_stats.csv")
+    assert stats.values.tolist() == [[1, 2, 1, 1], [2, 1, 1, 1]]
+
+    # A site without tagged questions still gets (empty) files with headers
+    edges = read_csv(output_dir, sx_dump_parser.NETWORKS_DIR, "empty_cotagging.csv")
+    assert list(edges.columns) == ["t1", "t2", "ct"] and edges.empty
+    stats = read_csv(output_dir, sx_dump_parser.STATS_DIR, "empty_cotagging_stats.csv")
+    assert list(stats.columns) == ["tag", "ct", "cotag", "cotag_u"] and stats.empty
+
+
+def test_regenerate_writes_summary_sorted_by_site(dump_dir, tmp_path):
+    output_dir = tmp_path / "sx"
+    sx_dump_parser.regenerate(str(dump_dir), str(output_dir), workers=3)
+
+    for directory in sx_dump_parser.SUMMARY_DIRS:
+        summary = read_csv(output_dir, directory, "dataset_stats.csv")
+        assert summary.values.tolist() == [
+            ["angled", 3, 3, 3],
+            ["empty", 0, 0, 0],
+            ["piped.com", 2, 2, 2],
+        ]
+
+
+def test_regenerate_merges_into_existing_summary(dump_dir, tmp_path):
+    output_dir = tmp_path / "sx"
+    for directory in sx_dump_parser.SUMMARY_DIRS:
+        os.makedirs(output_dir / directory)
+        pd.DataFrame({
+            "exchange": ["zebra", "angled", "aardvark"],
+            "num_post": [10, 99, 5],
+            "num_tag": [4, 99, 2],
+            "unique_tag": [4, 99, 2],
+        }).to_csv(output_dir / directory / "dataset_stats.csv")
+
+    sx_dump_parser.regenerate(str(dump_dir), str(output_dir), workers=2)
+
+    for directory in sx_dump_parser.SUMMARY_DIRS:
+        summary = read_csv(output_dir, directory, "dataset_stats.csv")
+        # Earlier sites are kept, re-parsed sites replace their stale rows
+        assert summary.values.tolist() == [
+            ["aardvark", 5, 2, 2],
+            ["angled", 3, 3, 3],
+            ["empty", 0, 0, 0],
+            ["piped.com", 2, 2, 2],
+            ["zebra", 10, 4, 4],
+        ]
+        assert summary.index.tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,115 @@
+from collections import Counter
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+import db_backend
+import tag_cooccurrence
+
+# question_id -> tag_ids
+QUESTIONS = {
+    1: [1, 2, 3],
+    2: [1, 2],
+    3: [1, 2, 4],
+    4: [1, 3],
+    5: [2, 3],
+    6: [4],
+}
+NAMES = {1: "python", 2: "pandas", 3: "numpy", 4: "django", 5: "unused"}
+
+
+def pair_counts():
+    counts = Counter()
+    for tag_ids in QUESTIONS.values():
+        counts.update(combinations(sorted(tag_ids), 2))
+    return counts
+
+
+def expected_related(tag_name, top_n):
+    tag_id = {name: tag_id for tag_id, name in NAMES.items()}[tag_name]
+    related = [(NAMES[t2 if t1 == tag_id else t1], count)
+               for (t1, t2), count in pair_counts().items() if tag_id in (t1, t2)]
+    related.sort(key=lambda pair: (-pair[1], pair[0]))
+    return related[:top_n]
+
+
+def rows(frame):
+    return list(zip(frame["tag_name"], frame["count"].astype(int)))
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setitem(tag_cooccurrence._loaded, "mtime", None)
+    monkeypatch.setitem(tag_cooccurrence._pair_counts, "checked_at", None)
+
+
+@pytest.fixture
+def matrix_file(tmp_path, monkeypatch):
+    """Build the co-occurrence matrix from QUESTIONS without a database."""
+    pairs = pd.DataFrame([(question_id, tag_id) for question_id, tag_ids in QUESTIONS.items() for tag_id in tag_ids],
+                         columns=["question_id", "tag_id"])
+    monkeypatch.setattr(tag_cooccurrence, "COOCCURRENCE_FILE", str(tmp_path / "data" / "tag_cooccurrence.npz"))
+    monkeypatch.setattr(db_backend, "read_sql", lambda query, params=None, compact_frame=True: pairs)
+    monkeypatch.setattr(db_backend, "tag_names", lambda tag_ids: pd.Categorical([NAMES[tag_id] for tag_id in tag_ids]))
+    monkeypatch.setattr(db_backend, "BACKEND", "duckdb")
+    tag_cooccurrence.build_cooccurrence()
+    return tmp_path / "data" / "tag_cooccurrence.npz"
+
+
+@pytest.mark.parametrize("tag_name", ["python", "pandas", "numpy", "django"])
+def test_related_tags_from_matrix(matrix_file, tag_name):
+    related = tag_cooccurrence.related_tags(tag_name, top_n=10)
+    # Ties may come in either order, so compare the counts and the set of tags
+    assert sorted(rows(related), key=lambda pair: (-pair[1], pair[0])) == expected_related(tag_name, 10)
+    assert list(related["count"]) == sorted(related["count"], reverse=True)
+
+
+def test_related_tags_top_n(matrix_file):
+    related = tag_cooccurrence.related_tags("python", top_n=1)
+    assert rows(related) == [("pandas", 3)]
+
+
+def test_related_tags_unknown_or_missing(matrix_file, monkeypatch):
+    assert tag_cooccurrence.related_tags("cobol").empty
+    monkeypatch.setattr(tag_cooccurrence, "COOCCURRENCE_FILE", str(matrix_file.parent / "missing.npz"))
+    assert list(tag_cooccurrence.related_tags("python").columns) == ["tag_name", "count"]
+    assert tag_cooccurrence.related_tags("python").empty
+
+
+@pytest.fixture
+def pair_counts_table(monkeypatch):
+    """tags and tag_pair_counts in an in-memory DuckDB, standing in for Postgres."""
+    duckdb = pytest.importorskip("duckdb")
+    connection = duckdb.connect(database=":memory:")
+    connection.execute("CREATE TABLE tags (tag_id INTEGER, name VARCHAR)")
+    connection.executemany("INSERT INTO tags VALUES (?, ?)", list(NAMES.items()))
+    connection.execute("CREATE TABLE tag_pair_counts (t1 INTEGER, t2 INTEGER, ct INTEGER)")
+    connection.executemany("INSERT INTO tag_pair_counts VALUES (?, ?, ?)",
+                           [(t1, t2, count) for (t1, t2), count in pair_counts().items()])
+    queries = []
+
+    def read_sql(query, params=None, compact_frame=True):
+        queries.append(query)
+        if "to_regclass" in query:
+            return pd.DataFrame({"present": [True]})
+        return connection.execute(query.replace("%s", "?"), list(params or ())).df()
+
+    monkeypatch.setattr(db_backend, "read_sql", read_sql)
+    monkeypatch.setattr(db_backend, "BACKEND", "postgres")
+    yield queries
+    connection.close()
+
+
+@pytest.mark.parametrize("tag_name", ["python", "pandas", "numpy", "django"])
+def test_related_tags_from_pair_counts(pair_counts_table, tag_name):
+    assert rows(tag_cooccurrence.related_tags(tag_name, top_n=2)) == expected_related(tag_name, 2)
+
+
+def test_pair_counts_preferred_over_stale_matrix(pair_counts_table, tmp_path, monkeypatch):
+    # No matrix file at all: the live table still answers
+    monkeypatch.setattr(tag_cooccurrence, "COOCCURRENCE_FILE", str(tmp_path / "missing.npz"))
+    assert rows(tag_cooccurrence.related_tags("django")) == [("pandas", 1), ("python", 1)]
+    tag_cooccurrence.related_tags("python")
+    # The table's existence is checked once, not per click
+    assert sum("to_regclass" in query for query in pair_counts_table) == 1
@@ -0,0 +1,135 @@
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import tag_history
+
+KEYFRAME_INTERVAL = 3
+NUM_SNAPSHOTS = 8  # Keyframes at 0, 3 and 6, so reads cross two keyframe boundaries
+
+
+@pytest.fixture
+def history_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tag_history, "HISTORY_DIR", str(tmp_path / "tag_history"))
+    monkeypatch.setattr(tag_history, "KEYFRAME_INTERVAL", KEYFRAME_INTERVAL)
+    tag_history._decoded.clear()
+    yield tmp_path / "tag_history"
+    tag_history._decoded.clear()
+
+
+def snapshot_date(number):
+    return (date(2024, 1, 1) + timedelta(days=7 * number)).isoformat()
+
+
+def make_snapshots():
+    """Snapshots where counts grow and shrink and tags come and go, ids in random order."""
+    rng = np.random.default_rng(550)
+    counts = {tag_id: int(rng.integers(0, 50000)) for tag_id in range(1, 200)}
+    snapshots = []
+    for number in range(NUM_SNAPSHOTS):
+        for tag_id in list(counts):
+            counts[tag_id] = max(counts[tag_id] + int(rng.integers(-500, 2000)), 0)
+            if rng.random() < 0.03:
+                del counts[tag_id]
+        for _ in range(5):
+            counts[int(rng.integers(200, 100000))] = int(rng.integers(0, 1000))
+        tag_ids = rng.permutation(list(counts))
+        snapshots.append((snapshot_date(number), tag_ids, np.array([counts[tag_id] for tag_id in tag_ids])))
+    return snapshots
+
+
+def expected(tag_ids, counts):
+    order = np.argsort(tag_ids)
+    return tag_ids[order].tolist(), counts[order].tolist()
+
+
+@pytest.fixture
+def snapshots(history_dir):
+    snapshots = make_snapshots()
+    for day, tag_ids, counts in snapshots:
+        tag_history.append_snapshot(tag_ids, counts, day)
+    return snapshots
+
+
+def stored_keyframes():
+    return [tag_history._read_partition(day)[2] for day in tag_history.list_snapshots()]
+
+
+def test_keyframes_every_interval(snapshots):
+    assert tag_history.list_snapshots() == [day for day, _, _ in snapshots]
+    assert stored_keyframes() == [number % KEYFRAME_INTERVAL == 0 for number in range(NUM_SNAPSHOTS)]
+
+
+def test_round_trip_in_order(snapshots):
+    for day, tag_ids, counts in snapshots:
+        tag_ids_read, counts_read = tag_history.load_snapshot(day)
+        assert (tag_ids_read.tolist(), counts_read.tolist()) == expected(tag_ids, counts)
+
+
+@pytest.mark.parametrize("number", range(NUM_SNAPSHOTS))
+def test_round_trip_cold(snapshots, number):
+    # Nothing decoded yet: the read has to replay from the nearest keyframe
+    tag_history._decoded.clear()
+    day, tag_ids, counts = snapshots[number]
+    tag_ids_read, counts_read = tag_history.load_snapshot(day)
+    assert (tag_ids_read.tolist(), counts_read.tolist()) == expected(tag_ids, counts)
+
+
+def test_round_trip_newest_first(snapshots):
+    tag_history._decoded.clear()
+    for day, tag_ids, counts in reversed(snapshots):
+        tag_ids_read, counts_read = tag_history.load_snapshot(day)
+        assert (tag_ids_read.tolist(), counts_read.tolist()) == expected(tag_ids, counts)
+
+
+def test_rerun_replaces_latest_snapshot(snapshots):
+    day, tag_ids, counts = snapshots[-1]
+    tag_history.append_snapshot(tag_ids, counts + 1, day)
+    assert tag_history.list_snapshots() == [day for day, _, _ in snapshots]
+    assert tag_history.load_snapshot(day)[1].tolist() == expected(tag_ids, counts + 1)[1]
+    # The snapshot before it is untouched
+    previous_day, previous_ids, previous_counts = snapshots[-2]
+    tag_history._decoded.clear()
+    assert tag_history.load_snapshot(previous_day)[1].tolist() == expected(previous_ids, previous_counts)[1]
+
+
+def test_older_snapshot_rejected(snapshots):
+    with pytest.raises(ValueError):
+        tag_history.append_snapshot([1], [1], snapshots[2][0])
+
+
+def test_unknown_snapshot_rejected(snapshots):
+    with pytest.raises(ValueError):
+        tag_history.load_snapshot("1999-01-01")
+
+
+def test_growth_across_keyframes(snapshots):
+    start_day, start_ids, start_counts = snapshots[1]
+    end_day, end_ids, end_counts = snapshots[7]
+    start = dict(zip(start_ids.tolist(), start_counts.tolist()))
+
+    result = tag_history.growth(start_day, end_day).set_index("tag_id")
+    assert sorted(result.index) == sorted(end_ids.tolist())
+    for tag_id, count in zip(end_ids.tolist(), end_counts.tolist()):
+        row = result.loc[tag_id]
+        assert row["start_count"] == start.get(tag_id, 0)
+        assert row["end_count"] == count
+        assert row["change"] == count - start.get(tag_id, 0)
+        assert row["daily_change"] == pytest.approx(row["change"] / 42)
+
+
+def test_count_history(snapshots):
+    tag_ids = [1, 2, 3]
+    history = tag_history.count_history(tag_ids)
+    for day, snapshot_ids, counts in snapshots:
+        counts_by_tag = dict(zip(snapshot_ids.tolist(), counts.tolist()))
+        rows = history[history["snapshot_date"] == day]
+        assert dict(zip(rows["tag_id"], rows["count"])) == {
+            tag_id: counts_by_tag[tag_id] for tag_id in tag_ids if tag_id in counts_by_tag
+        }
+
+
+def test_no_partial_snapshots_left(snapshots, history_dir):
+    assert not [name for name in os.listdir(history_dir) if name.endswith(".part")]
@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+import data_fetcher_tree
+import tag_index
+
+# question_id -> tags, for questions 1..8
+POSTINGS = {
+    "python": [1, 2, 3, 4, 5],
+    "pandas": [2, 3, 6],
+    "numpy": [3, 4],
+    "r": [7, 8],
+    "c++": [5],
+}
+SCORES = [10, 50, 30, 5, 40, 20, 60, 1]
+VIEW_COUNTS = [100, 1, 2, 3, 4, 5, 6, 7]
+
+
+@pytest.fixture
+def index():
+    """An index in the layout load_index returns, built from POSTINGS."""
+    names = sorted(POSTINGS)
+    lengths = [len(POSTINGS[name]) for name in names]
+    return {
+        "tag_names": np.array(names),
+        "indptr": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        "postings": np.concatenate([POSTINGS[name] for name in names]).astype(np.uint32),
+        "question_ids": np.arange(1, 9, dtype=np.uint32),
+        "scores": np.array(SCORES, dtype=np.int32),
+        "view_counts": np.array(VIEW_COUNTS, dtype=np.int32),
+        "tags": {name: number for number, name in enumerate(names)},
+    }
+
+
+@pytest.fixture
+def loaded(index, monkeypatch):
+    monkeypatch.setattr(tag_index, "load_index", lambda: index)
+    return index
+
+
+def tag(name):
+    return ("tag", name)
+
+
+@pytest.mark.parametrize("text, tree", [
+    ("python", tag("python")),
+    # AND binds tighter than OR
+    ("a OR b AND c", ("or", [tag("a"), ("and", [tag("b"), tag("c")])])),
+    ("a AND b OR c", ("or", [("and", [tag("a"), tag("b")]), tag("c")])),
+    # Parentheses override precedence
+    ("(a OR b) AND c", ("and", [("or", [tag("a"), tag("b")]), tag("c")])),
+    ("a AND (b OR (c AND d))", ("and", [tag("a"), ("or", [tag("b"), ("and", [tag("c"), tag("d")])])])),
+    # Adjacent tags are ANDed
+    ("a b", ("and", [tag("a"), tag("b")])),
+    # NOT applies to the next factor only
+    ("NOT a AND b", ("and", [("not", tag("a")), tag("b")])),
+    ("NOT (a OR b)", ("not", ("or", [tag("a"), tag("b")]))),
+    ("NOT NOT a", ("not", ("not", tag("a")))),
+    # Keywords are case-insensitive, tags are lower-cased and may hold punctuation
+    ("Python and not C++", ("and", [tag("python"), ("not", tag("c++"))])),
+    ("(.net)", tag(".net")),
+])
+def test_parse_expression(text, tree):
+    assert tag_index.parse_expression(text) == tree
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "Enter at least one tag."),
+    ("   ", "Enter at least one tag."),
+    ("python AND", "Expression ends unexpectedly."),
+    ("NOT", "Expression ends unexpectedly."),
+    ("(python OR r", "Missing closing parenthesis."),
+    ("python )", "Unexpected ')'."),
+    ("AND python", "Unexpected 'AND'."),
+    ("python OR OR r", "Unexpected 'OR'."),
+    ("()", "Unexpected ')'."),
+])
+def test_parse_expression_rejects_malformed_input(text, message):
+    with pytest.raises(ValueError) as error:
+        tag_index.parse_expression(text)
+    assert str(error.value) == message
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("python", [1, 2, 3, 4, 5]),
+    ("python AND pandas AND NOT numpy", [2]),
+    ("python pandas", [2, 3]),
+    ("python OR r", [1, 2, 3, 4, 5, 7, 8]),
+    ("pandas OR numpy AND python", [2, 3, 4, 6]),
+    ("(pandas OR numpy) AND python", [2, 3, 4]),
+    ("NOT python", [6, 7, 8]),
+    ("NOT NOT r", [7, 8]),
+    ("NOT python AND NOT r", [6]),
+    ("NOT (python OR r)", [6]),
+    ("python AND NOT (numpy OR c++)", [1, 2]),
+    # Unknown tags match nothing
+    ("go", []),
+    ("python AND go", []),
+    ("python AND NOT go", [1, 2, 3, 4, 5]),
+    ("go OR r", [7, 8]),
+])
+def test_evaluate(index, text, expected):
+    assert tag_index.evaluate(tag_index.parse_expression(text), index).tolist() == expected
+
+
+def test_intersect_gallops_on_lopsided_lists():
+    long = np.arange(0, 1000, dtype=np.uint32)
+    short = np.array([3, 500, 1500], dtype=np.uint32)
+    assert tag_index.intersect(short, long).tolist() == [3, 500]
+    assert tag_index.intersect(long, short).tolist() == [3, 500]
+    assert tag_index.intersect(np.empty(0, dtype=np.uint32), long).tolist() == []
+
+
+def test_difference_and_union():
+    a = np.array([1, 3, 5, 7], dtype=np.uint32)
+    b = np.array([3, 4, 7, 9], dtype=np.uint32)
+    assert tag_index.difference(a, b).tolist() == [1, 5]
+    assert tag_index.difference(a, np.empty(0, dtype=np.uint32)).tolist() == [1, 3, 5, 7]
+    assert tag_index.union([a, b]).tolist() == [1, 3, 4, 5, 7, 9]
+    assert tag_index.union([]).tolist() == []
+
+
+def test_query_questions_orders_and_limits(loaded):
+    total, top = tag_index.query_questions("python", "score", limit=2)
+    assert total == 5
+    assert top["question_id"].tolist() == [2, 5]
+    assert top["score"].tolist() == [50, 40]
+
+    total, top = tag_index.query_questions("python", "view_count", limit=2)
+    assert top["question_id"].tolist() == [1, 5]
+
+    total, top = tag_index.query_questions("python AND go")
+    assert total == 0 and top.empty
+
+
+def test_query_questions_without_index(monkeypatch):
+    monkeypatch.setattr(tag_index, "load_index", lambda: None)
+    total, top = tag_index.query_questions("python")
+    assert total == 0 and top.empty
+
+
+def test_fetch_tagged_questions_raises_for_malformed_expression(loaded):
+    with pytest.raises(ValueError, match="Missing closing parenthesis."):
+        data_fetcher_tree.fetch_tagged_questions("(python")
+
+
+def test_fetch_tagged_questions_returns_empty_frame_on_error(loaded, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(data_fetcher_tree.db_backend, "read_sql", fail)
+    total, questions = data_fetcher_tree.fetch_tagged_questions("python")
+    assert total == 0
+    assert questions.empty
+    assert list(questions.columns) == ["question_id", "score", "view_count", "title", "link"]
@@ -0,0 +1,143 @@
+import importlib.util
+import os
+import random
+from collections import Counter
+from itertools import combinations
+
+import psycopg2
+import pytest
+
+from conftest import ROOT
+
+
+class FakeCursor:
+    """Answers the loader's queries from an in-memory questiontags table and tag_pair_counts."""
+
+    def __init__(self):
+        self.question_tags = set()
+        self.pair_counts = Counter()
+        self.upserts = []
+        self.result = []
+
+    def execute(self, query, params=None):
+        if "pg_partitioned_table" in query:
+            self.result = [(False,)]
+        elif "to_regclass('tag_pair_counts')" in query:
+            self.result = [(True,)]
+        elif "FROM questiontags WHERE question_id = ANY" in query:
+            question_ids = set(params[0])
+            self.result = [row for row in sorted(self.question_tags) if row[0] in question_ids]
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """insert_top_voted_question run against a fake connection, with no pages to load."""
+    cursor = FakeCursor()
+    monkeypatch.setattr(psycopg2, "connect", lambda **kwargs: FakeConnection(cursor))
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("Top Voted Question")
+    spec = importlib.util.spec_from_file_location("insert_top_voted_question",
+                                                  os.path.join(ROOT, "insert_top_voted_question.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.TAG_PAIR_COUNTS
+
+    def execute_values(cur, query, argslist, **kwargs):
+        assert cur is cursor and "ON CONFLICT (t1, t2)" in query
+        cursor.upserts.append(argslist)
+        for t1, t2, ct in argslist:
+            cursor.pair_counts[t1, t2] += ct
+
+    monkeypatch.setattr(module, "execute_values", execute_values)
+    return module, cursor
+
+
+def load(loader, question_tags):
+    """Insert (question_id, tag_id) rows as the loader does: only rows not already present count as inserted."""
+    module, cursor = loader
+    inserted = []
+    for row in question_tags:
+        if row not in cursor.question_tags:
+            cursor.question_tags.add(row)
+            inserted.append(row)
+    module.update_tag_pair_counts(inserted)
+
+
+def recount(question_tags):
+    """tag_pair_counts rebuilt from scratch, as database/tag_pair_counts.sql does."""
+    tags = {}
+    for question_id, tag_id in question_tags:
+        tags.setdefault(question_id, set()).add(tag_id)
+    counts = Counter()
+    for tag_ids in tags.values():
+        counts.update(combinations(sorted(tag_ids), 2))
+    return counts
+
+
+def test_new_questions(loader):
+    _, cursor = loader
+    load(loader, [(1, 9), (1, 3), (1, 5), (2, 5), (2, 3)])
+    assert cursor.pair_counts == Counter({(3, 5): 2, (3, 9): 1, (5, 9): 1})
+    assert cursor.pair_counts == recount(cursor.question_tags)
+
+
+def test_tags_added_to_existing_question(loader):
+    _, cursor = loader
+    load(loader, [(1, 9), (1, 3)])
+    # A rerun where the question gained two tags: new x new and new x existing pairs
+    load(loader, [(1, 9), (1, 3), (1, 7), (1, 1)])
+    assert cursor.pair_counts == recount(cursor.question_tags)
+    assert cursor.pair_counts == Counter({pair: 1 for pair in combinations([1, 3, 7, 9], 2)})
+
+
+def test_canonical_pair_order(loader):
+    _, cursor = loader
+    load(loader, [(1, 9), (1, 3)])
+    load(loader, [(1, 2), (2, 8), (2, 4)])
+    for argslist in cursor.upserts:
+        assert all(t1 < t2 for t1, t2, _ in argslist)
+        # Upserts are sorted so concurrent loaders lock pairs in the same order
+        assert argslist == sorted(argslist)
+    assert cursor.pair_counts == recount(cursor.question_tags)
+
+
+def test_existing_rows_not_counted_twice(loader):
+    _, cursor = loader
+    rows = [(1, 9), (1, 3), (1, 5), (2, 5), (2, 3)]
+    load(loader, rows)
+    upserts = len(cursor.upserts)
+    load(loader, rows)
+    load(loader, [])
+    assert len(cursor.upserts) == upserts
+    assert cursor.pair_counts == recount(cursor.question_tags)
+
+
+def test_matches_recount_over_many_loads(loader):
+    _, cursor = loader
+    rng = random.Random(550)
+    for _ in range(30):
+        batch = [(rng.randint(1, 20), rng.randint(1, 15)) for _ in range(rng.randint(0, 25))]
+        load(loader, batch)
+    assert cursor.pair_counts == recount(cursor.question_tags)
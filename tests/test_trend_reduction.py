@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_fetcher_trend import OTHER_TAG, lttb_indices, reduce_trend_series
+
+NUM_DATES = 2000
+NUM_TAGS = 40
+
+
+@pytest.fixture
+def trend_data():
+    """Daily question counts per tag, shaped like fetch_trend_data's query result, with gaps."""
+    rng = np.random.default_rng(550)
+    dates = pd.date_range("2021-01-01", periods=NUM_DATES, freq="D")
+    frame = pd.DataFrame({
+        "tag": np.repeat([f"tag-{number}" for number in range(NUM_TAGS)], NUM_DATES),
+        "creation_date": np.tile(dates, NUM_TAGS),
+        "question_count": rng.poisson(np.repeat(np.linspace(50, 1, NUM_TAGS), NUM_DATES)),
+    })
+    # Days without questions have no row
+    return frame[frame["question_count"] > 0].reset_index(drop=True)
+
+
+def test_lttb_keeps_endpoints_and_size():
+    rng = np.random.default_rng(550)
+    x = np.arange(1000, dtype=np.float64)
+    y = rng.random(1000)
+    indices = lttb_indices(x, y, 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 999
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(1000)
+    y[[137, 512, 871]] = 100.0
+    indices = lttb_indices(np.arange(1000, dtype=np.float64), y, 50)
+    assert {137, 512, 871} <= set(indices.tolist())
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 10), (10, 50), (10, 2), (0, 5)])
+def test_lttb_short_input_unchanged(n, n_out):
+    assert lttb_indices(np.arange(n, dtype=np.float64), np.ones(n), n_out).tolist() == list(range(n))
+
+
+def test_reduce_caps_traces_and_points(trend_data):
+    reduced = reduce_trend_series(trend_data, top_n=5, max_points=300)
+    assert reduced["tag"].nunique() == 6
+    assert reduced["creation_date"].nunique() == 300
+    # Every trace has the same timestamps, so the areas stack
+    assert (reduced.groupby("tag", observed=True)["creation_date"].nunique() == 300).all()
+    assert reduced["creation_date"].min() == trend_data["creation_date"].min()
+    assert reduced["creation_date"].max() == trend_data["creation_date"].max()
+
+
+def test_reduce_folds_other_tags_keeping_totals(trend_data):
+    reduced = reduce_trend_series(trend_data, top_n=5, max_points=NUM_DATES)
+    totals = trend_data.groupby("tag")["question_count"].sum().sort_values(ascending=False)
+    assert list(reduced["tag"].unique()) == list(totals.index[:5]) + [OTHER_TAG]
+
+    # Folding loses no questions on any date
+    per_date = trend_data.groupby("creation_date")["question_count"].sum()
+    reduced_per_date = reduced.groupby("creation_date")["question_count"].sum()
+    assert reduced_per_date.reindex(per_date.index).tolist() == per_date.tolist()
+    other = reduced[reduced["tag"] == OTHER_TAG]["question_count"].sum()
+    assert other == totals.iloc[5:].sum()
+
+
+def test_reduce_small_input_unchanged(trend_data):
+    small = trend_data[trend_data["tag"].isin(["tag-0", "tag-1"])
+                       & (trend_data["creation_date"] < "2021-02-01")]
+    reduced = reduce_trend_series(small, top_n=5, max_points=500)
+    assert OTHER_TAG not in set(reduced["tag"])
+    merged = small.merge(reduced, on=["tag", "creation_date"], how="left", suffixes=("", "_reduced"))
+    assert (merged["question_count"] == merged["question_count_reduced"]).all()
+
+
+def test_reduce_categorical_tags(trend_data):
+    categorical = trend_data.assign(tag=trend_data["tag"].astype("category"))
+    reduced = reduce_trend_series(categorical, top_n=3, max_points=100)
+    assert set(reduced["tag"]) == {"tag-0", "tag-1", "tag-2", OTHER_TAG}
+    assert reduced["question_count"].sum() > 0